@@ -9,26 +9,170 @@ Uses Claude Sonnet 4 for optimal balance of quality and speed.
 """
 
 import os
-import json
 import asyncio
+import hashlib
+import random
+import time
 import re
-from typing import Optional
+import logging
+from collections import deque
+from itertools import islice
+from typing import Awaitable, Callable, Optional
 from dataclasses import dataclass, field
-from datetime import datetime
 
 import anthropic
+import httpx
+import orjson
 from dotenv import load_dotenv
 
-from prompts import THINKING_PARTNER_SYSTEM_PROMPT, build_thinking_prompt
+from prompts import (
+    RECENT_MESSAGE_WINDOW,
+    SYSTEM_PROMPT_UTF8,
+    THINKING_PARTNER_SYSTEM_PROMPT,
+    TRANSCRIPT_MAX_CHARS,
+    TRANSCRIPT_SUMMARY_SYSTEM_PROMPT,
+    build_summary_prompt,
+    build_thinking_prompt,
+)
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Fingerprint state seeded with the (static) system prompt; copied per call
+_SYSTEM_PROMPT_DIGEST = hashlib.sha256(SYSTEM_PROMPT_UTF8)
+
+# Response parsing patterns, compiled once at import
+_QUESTION_RE = re.compile(r'[^.!?\n]*\?')
+_QUESTION_PREFIX_RE = re.compile(r'^[\d\.\)\-\*\•]+\s*')
+
+# Matches the opening of the "conversation" string value in streamed JSON
+_CONVERSATION_OPEN_RE = re.compile(r'"conversation"\s*:\s*"')
+
+# Up to the four hex digits of a \uXXXX escape
+_HEX_DIGITS_RE = re.compile(r'[0-9a-fA-F]{0,4}')
+
+# Single-character JSON escape sequences
+_JSON_ESCAPES = {
+    '"': '"', '\\': '\\', '/': '/',
+    'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t',
+}
+
+# Keys of a full AI response; the split calls each look for their own key
+_RESPONSE_KEYS = ("conversation", "document_updates")
+
+# Section where thoughts land when Claude couldn't process them
+UNPROCESSED_THOUGHTS_SECTION = "Unprocessed Thoughts"
+
+
+def _hex4(text: str, pos: int) -> Optional[int]:
+    """
+    Decode the four hex digits of a \\u escape starting at pos.
+
+    Returns -1 if the text ends before the digits are complete, or None if
+    they aren't valid hex.
+    """
+    digits = _HEX_DIGITS_RE.match(text, pos).group()
+    if len(digits) == 4:
+        return int(digits, 16)
+    return -1 if pos + len(digits) == len(text) else None
+
+
+def _find_json_span(
+    text: str,
+    start: int = 0,
+    keys: tuple[str, ...] = _RESPONSE_KEYS
+) -> Optional[tuple[int, int]]:
+    """
+    Find the first balanced JSON object holding an AI response.
+
+    Walks the text once, tracking brace depth and string/escape state, and
+    returns the (start, end) slice of the first top-level object that has
+    all of keys (by default both "conversation" and "document_updates").
+    """
+    needles = [f'"{key}"' for key in keys]
+    depth = 0
+    in_string = False
+    escaped = False
+    obj_start = -1
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == "{":
+            if depth == 0:
+                obj_start = i
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth == 0 and all(
+                text.find(needle, obj_start, i) != -1 for needle in needles
+            ):
+                return obj_start, i + 1
+        elif char == '"' and depth:
+            # Only track strings inside objects; quotes in prose don't count
+            in_string = True
+
+    return None
+
+
+# Shared Anthropic client so every session reuses pooled TCP/TLS connections
+_http_client: Optional[httpx.AsyncClient] = None
+_anthropic_client: Optional[anthropic.AsyncAnthropic] = None
+
+
+def get_anthropic_client(api_key: str) -> anthropic.AsyncAnthropic:
+    """Get the process-wide Anthropic client, creating it on first use."""
+    global _http_client, _anthropic_client
+
+    if _anthropic_client is None:
+        # HTTP/2 multiplexes concurrent turns over one connection; idle
+        # connections are kept past a typical pause between turns (httpx
+        # drops them after 5s by default) so the next turn skips the handshake
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=100,
+                keepalive_expiry=120.0,
+            ),
+            timeout=httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0),
+        )
+        _anthropic_client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            http_client=_http_client,
+        )
+    return _anthropic_client
+
+
+async def close_anthropic_client() -> None:
+    """Close the shared Anthropic client and its connection pool."""
+    global _http_client, _anthropic_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _anthropic_client = None
+
+
+# Caps the number of in-flight Claude requests across all sessions, so a
+# burst of sessions queues locally instead of triggering rate-limit storms.
+# Semaphore.release() is synchronous, so a task cancelled on its way out
+# can't leak a slot.
+_claude_admission = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_CLAUDE_REQUESTS", 8)))
+
 
 @dataclass
 class PendingQuestion:
     """Represents a question asked by the AI that hasn't been answered yet."""
     question: str
-    asked_at: datetime = field(default_factory=datetime.utcnow)
+    asked_at_ns: int = field(default_factory=time.monotonic_ns)  # For ordering/age checks only
     context: str = ""  # What topic/thought prompted this question
     answered: bool = False
     answer: str = ""
@@ -63,24 +207,28 @@ class AIResponse:
     questions_asked: list[str]  # Questions extracted from the response
     raw_response: str  # Original response for debugging
 
+    @classmethod
+    def from_dict(cls, data: dict, raw_response: str = "") -> "AIResponse":
+        """Build AI response from an already-parsed JSON object."""
+        updates = [
+            DocumentUpdate.from_dict(u)
+            for u in data.get("document_updates", [])
+        ]
+        conversation = data.get("conversation", "")
+        questions = cls._extract_questions(conversation)
+        return cls(
+            conversation=conversation,
+            document_updates=updates,
+            questions_asked=questions,
+            raw_response=raw_response
+        )
+
     @classmethod
     def from_json(cls, json_str: str) -> "AIResponse":
         """Parse AI response from JSON string."""
         try:
-            data = json.loads(json_str)
-            updates = [
-                DocumentUpdate.from_dict(u)
-                for u in data.get("document_updates", [])
-            ]
-            conversation = data.get("conversation", "")
-            questions = cls._extract_questions(conversation)
-            return cls(
-                conversation=conversation,
-                document_updates=updates,
-                questions_asked=questions,
-                raw_response=json_str
-            )
-        except json.JSONDecodeError as e:
+            return cls.from_dict(orjson.loads(json_str), raw_response=json_str)
+        except orjson.JSONDecodeError:
             # If JSON parsing fails, try to extract conversation from raw text
             return cls(
                 conversation=f"I understood your thought. {json_str[:500]}",
@@ -104,19 +252,143 @@ class AIResponse:
         questions = []
 
         # Pattern 1: Direct questions ending with ?
-        question_pattern = r'[^.!?\n]*\?'
-        matches = re.findall(question_pattern, text)
-
-        for match in matches:
-            question = match.strip()
+        for match in _QUESTION_RE.finditer(text):
             # Clean up: remove leading numbers, bullets, dashes
-            question = re.sub(r'^[\d\.\)\-\*\•]+\s*', '', question)
+            question = _QUESTION_PREFIX_RE.sub('', match.group().strip())
             if question and len(question) > 10:  # Filter out very short matches
                 questions.append(question)
 
         return questions
 
 
+class ConversationStreamParser:
+    """
+    Incrementally extracts the "conversation" value from streamed JSON.
+
+    Claude's response is a JSON object, so the conversational text arrives
+    as an escaped string somewhere inside it. Feed raw text chunks as they
+    stream in; each call returns the newly decoded conversation text, so it
+    can be shown to the user before document_updates have been generated.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._opened = False
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk of streamed text, returning any new conversation text."""
+        if self.done:
+            return ""
+
+        self._buffer += chunk
+        if not self._opened:
+            match = _CONVERSATION_OPEN_RE.search(self._buffer)
+            if not match:
+                return ""
+            self._opened = True
+            self._pos = match.end()
+
+        buffer = self._buffer
+        end = len(buffer)
+        i = self._pos
+        decoded = []
+
+        while i < end:
+            char = buffer[i]
+            if char == '"':
+                # Closing quote - conversation value is complete
+                self.done = True
+                i += 1
+                break
+            if char != "\\":
+                decoded.append(char)
+                i += 1
+                continue
+
+            # Escape sequence - wait for more input if it's incomplete
+            if i + 1 >= end:
+                break
+            escaped = buffer[i + 1]
+            if escaped != "u":
+                decoded.append(_JSON_ESCAPES.get(escaped, escaped))
+                i += 2
+                continue
+
+            code = _hex4(buffer, i + 2)
+            if code == -1:
+                break
+            if code is None:
+                # Malformed escape - pass it through as text
+                decoded.append(buffer[i:i + 2])
+                i += 2
+                continue
+
+            if 0xD800 <= code <= 0xDBFF:
+                # High surrogate - combine with a following low surrogate,
+                # waiting for it while the input could still be one
+                if buffer.startswith("\\u", i + 6):
+                    low = _hex4(buffer, i + 8)
+                elif buffer[i + 6:] in ("", "\\"):
+                    low = -1
+                else:
+                    low = None
+                if low == -1:
+                    break
+                if low is not None and 0xDC00 <= low <= 0xDFFF:
+                    decoded.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    i += 12
+                    continue
+                # Unpaired high surrogate - not encodable, replace it
+                code = 0xFFFD
+            elif 0xDC00 <= code <= 0xDFFF:
+                # Lone low surrogate - not encodable, replace it
+                code = 0xFFFD
+            decoded.append(chr(code))
+            i += 6
+
+        self._pos = i
+        return "".join(decoded)
+
+
+def format_document_structure(structure: dict) -> str:
+    """
+    Format document structure as a concise summary for the prompt.
+
+    Instead of sending full markdown, sends a structured overview
+    so Claude knows what sections exist and their purpose.
+    """
+    sections = structure.get("sections", [])
+    if not sections:
+        return "(Empty - this is a new session)"
+
+    lines = ["Current document sections:"]
+    for section in sections:
+        title = section.get("title", "Untitled")
+        content = section.get("content", "")
+        subsections = section.get("subsections", [])
+
+        # Create a brief summary of content
+        content_preview = ""
+        if content:
+            # Show first 100 chars or first 2 bullet points
+            content_lines = content.strip().split('\n')[:2]
+            content_preview = " | ".join(line.strip()[:50] for line in content_lines if line.strip())
+
+        # Format section info
+        subsection_names = [s.get("title", "") for s in subsections if s.get("title")]
+        if subsection_names:
+            lines.append(f"- **{title}** (subsections: {', '.join(subsection_names)})")
+        else:
+            lines.append(f"- **{title}**")
+
+        if content_preview:
+            lines.append(f"  Preview: {content_preview}...")
+
+    return "\n".join(lines)
+
+
 class AIProcessor:
     """
     Processes user thoughts using Claude AI.
@@ -133,11 +405,28 @@ class AIProcessor:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable is required")
 
-        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+        self.client = get_anthropic_client(api_key)
         self.model = "claude-sonnet-4-20250514"  # Claude Sonnet 4
         self.max_tokens = 2048
+        # Output caps for the split conversation / document update calls
+        self.conversation_max_tokens = 512
+        self.updates_max_tokens = 1024
         self.max_retries = 3
         self.retry_delay_base = 2  # Base delay for exponential backoff
+        # Small, cheap model for rolling up old transcript into a summary
+        self.summary_model = "claude-3-5-haiku-20241022"
+        self.summary_max_tokens = 400
+
+        # System prompt is static, so mark it cacheable once up front
+        self._system_blocks = [
+            {
+                "type": "text",
+                "text": THINKING_PARTNER_SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+        # Fingerprint of the last cached prompt prefix, to spot cache misses
+        self._prefix_fingerprint: Optional[str] = None
 
     async def process_thought(
         self,
@@ -146,7 +435,9 @@ class AIProcessor:
         recent_conversations: list[dict],
         question_context: dict = None,
         document_structure: dict = None,
-        full_transcript: str = None
+        full_transcript: str = None,
+        on_conversation_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+        transcript_summary: str = None
     ) -> AIResponse:
         """
         Process a new thought from the user.
@@ -157,7 +448,10 @@ class AIProcessor:
             recent_conversations: Recent conversation history
             question_context: Dict with pending and recently answered questions
             document_structure: Structured JSON of document sections (optional, preferred over markdown)
-            full_transcript: Complete transcript of the session for context
+            full_transcript: Recent verbatim transcript of the session
+            on_conversation_delta: Async callback receiving conversation text
+                as it streams in, before the full response is parsed
+            transcript_summary: Rolling summary of older transcript
 
         Returns:
             AIResponse with conversation reply and document updates
@@ -165,117 +459,297 @@ class AIProcessor:
         # Use structured document if available, otherwise fall back to markdown
         doc_context = current_document
         if document_structure:
-            doc_context = self._format_document_structure(document_structure)
+            doc_context = format_document_structure(document_structure)
 
-        # Build the user prompt with context
-        user_prompt = build_thinking_prompt(
+        # Build the user prompts with context (cacheable prefix + dynamic tail).
+        # The reply and the document updates are independent, so they are
+        # requested in parallel and share the cached prefix.
+        prompt_args = dict(
             current_document=doc_context,
             recent_conversations=recent_conversations,
             new_thought=new_thought,
             question_context=question_context,
-            full_transcript=full_transcript
+            full_transcript=full_transcript,
+            transcript_summary=transcript_summary
         )
+        conversation_content = build_thinking_prompt(**prompt_args, task="conversation")
+        updates_content = build_thinking_prompt(**prompt_args, task="document_updates")
+        has_structure = bool(doc_context)
+
+        calls = [
+            asyncio.create_task(self._complete(
+                conversation_content,
+                on_conversation_delta,
+                max_tokens=min(
+                    self._dynamic_max_tokens(new_thought, has_structure=False),
+                    self.conversation_max_tokens
+                )
+            )),
+            asyncio.create_task(self._complete(
+                updates_content,
+                max_tokens=min(
+                    self._dynamic_max_tokens(new_thought, has_structure),
+                    self.updates_max_tokens
+                )
+            )),
+        ]
+
+        try:
+            conversation_text, updates_text = await asyncio.gather(*calls)
+            # Each call only fills in its own half of the response, so a
+            # reply that leaves out the other key still parses
+            conversation, updates = await asyncio.gather(
+                self._parse_response(conversation_text, keys=("conversation",)),
+                self._parse_response(updates_text, keys=("document_updates",))
+            )
+            return self._merge_responses(conversation, updates)
+
+        except (anthropic.BadRequestError, anthropic.AuthenticationError):
+            # Permanent failures point at a bug or misconfiguration - surface them
+            raise
+
+        except (anthropic.APIError, httpx.HTTPError) as e:
+            # The SDK doesn't wrap read errors and timeouts that happen
+            # while the response is streaming, so catch httpx's too
+            logger.exception(
+                "Claude request failed, using fallback response",
+                extra={"thought_len": len(new_thought)}
+            )
+            return self._fallback_response(new_thought, str(e))
+
+        finally:
+            # gather doesn't cancel the other call when one fails. Stop it so
+            # it doesn't keep streaming deltas after the fallback response or
+            # hold an admission slot, and collect its result or error.
+            for call in calls:
+                call.cancel()
+            await asyncio.gather(*calls, return_exceptions=True)
+
+    async def _complete(
+        self,
+        user_content: list[dict],
+        on_conversation_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Call Claude and return the response text.
+
+        A response cut off at a reduced max_tokens would fail to parse, so
+        it is requested again once with the full self.max_tokens.
+        """
+        cap = max_tokens or self.max_tokens
+        text, stop_reason = await self._call_with_retries(user_content, on_conversation_delta, cap)
+        if stop_reason == "max_tokens" and cap < self.max_tokens:
+            logger.warning(
+                "Claude response truncated at max_tokens=%d, retrying with %d",
+                cap, self.max_tokens
+            )
+            # Not streamed again - the final ai_response replaces the
+            # partial text the client already has
+            cap = self.max_tokens
+            text, stop_reason = await self._call_with_retries(user_content, None, cap)
+        if stop_reason == "max_tokens":
+            logger.warning("Claude response truncated at max_tokens=%d", cap)
+        return text
+
+    async def _call_with_retries(
+        self,
+        user_content: list[dict],
+        on_conversation_delta: Optional[Callable[[str], Awaitable[None]]],
+        max_tokens: int
+    ) -> tuple[str, Optional[str]]:
+        """
+        Call Claude, retrying transient connection, server and rate-limit errors.
 
-        # Try to get response with retries
+        Raises the last error once retries are exhausted.
+        """
         for attempt in range(self.max_retries):
             try:
-                response = await self._call_claude(user_prompt)
-                return self._parse_response(response)
-
-            except anthropic.APIConnectionError as e:
-                if attempt < self.max_retries - 1:
-                    delay = self.retry_delay_base ** (attempt + 1)
-                    print(f"API connection error, retrying in {delay}s: {e}")
-                    await asyncio.sleep(delay)
-                else:
-                    return self._fallback_response(new_thought, str(e))
+                return await self._call_claude(user_content, on_conversation_delta, max_tokens)
+
+            except (anthropic.APIConnectionError, anthropic.InternalServerError) as e:
+                # APIConnectionError also covers APITimeoutError
+                if attempt >= self.max_retries - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(
+                    "Transient API error, retrying in %.1fs: %s", delay, e,
+                    extra={"attempt": attempt}
+                )
+                await asyncio.sleep(delay)
 
             except anthropic.RateLimitError as e:
-                if attempt < self.max_retries - 1:
-                    delay = self.retry_delay_base ** (attempt + 1)
-                    print(f"Rate limited, retrying in {delay}s: {e}")
-                    await asyncio.sleep(delay)
-                else:
-                    return self._fallback_response(new_thought, str(e))
+                if attempt >= self.max_retries - 1:
+                    raise
+                delay = self._retry_delay(attempt, e)
+                logger.warning(
+                    "Rate limited, retrying in %.1fs: %s", delay, e,
+                    extra={"attempt": attempt}
+                )
+                await asyncio.sleep(delay)
 
-            except anthropic.APIStatusError as e:
-                print(f"API error: {e}")
-                return self._fallback_response(new_thought, str(e))
+    def _dynamic_max_tokens(self, thought: str, has_structure: bool) -> int:
+        """
+        Get an output token cap sized to the thought.
 
-            except Exception as e:
-                print(f"Unexpected error: {e}")
-                return self._fallback_response(new_thought, str(e))
+        Short thoughts usually need one clarifying question, so they get a
+        small budget; longer thoughts and existing documents get more room.
+        Never exceeds self.max_tokens.
+        """
+        budget = 256 + min(len(thought) // 4, 512)
+        if has_structure:
+            budget += 512
+        return min(budget, self.max_tokens)
 
-        return self._fallback_response(new_thought, "Max retries exceeded")
+    def _retry_delay(self, attempt: int, error: Optional[anthropic.APIStatusError] = None) -> float:
+        """
+        Get the delay before the next retry.
 
-    async def _call_claude(self, user_prompt: str) -> str:
+        Honors the server's Retry-After header when present, falling back to
+        exponential backoff, plus up to 20% jitter so clients don't retry in
+        lockstep.
+        """
+        delay = float(self.retry_delay_base ** (attempt + 1))
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    pass
+        return delay + random.uniform(0, delay * 0.2)
+
+    async def _call_claude(
+        self,
+        user_content: list[dict],
+        on_conversation_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+        max_tokens: Optional[int] = None
+    ) -> tuple[str, Optional[str]]:
         """
         Make the actual API call to Claude.
 
+        The response is streamed so the conversational part can be forwarded
+        as soon as it is generated. Document updates are only parsed once
+        the full response has arrived.
+
         Args:
-            user_prompt: The formatted user message
+            user_content: Content blocks for the user message
+            on_conversation_delta: Async callback for streamed conversation text
+            max_tokens: Output token cap, defaults to self.max_tokens
 
         Returns:
-            Raw response text from Claude
-        """
-        message = await self.client.messages.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            system=THINKING_PARTNER_SYSTEM_PROMPT,
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
+            Raw response text from Claude and the stop reason
+        """
+        self._check_prefix_fingerprint(user_content)
+
+        async with _claude_admission:
+            async with self.client.messages.stream(
+                model=self.model,
+                max_tokens=max_tokens or self.max_tokens,
+                system=self._system_blocks,
+                messages=[
+                    {"role": "user", "content": user_content}
+                ]
+            ) as stream:
+                if on_conversation_delta:
+                    parser = ConversationStreamParser()
+                    async for text in stream.text_stream:
+                        delta = parser.feed(text)
+                        if delta:
+                            await on_conversation_delta(delta)
+                message = await stream.get_final_message()
+
+        usage = message.usage
+        logger.info(
+            "Claude usage: input=%s cache_read=%s cache_creation=%s output=%s",
+            usage.input_tokens,
+            usage.cache_read_input_tokens,
+            usage.cache_creation_input_tokens,
+            usage.output_tokens,
         )
 
         # Extract text from response
         if message.content and len(message.content) > 0:
-            return message.content[0].text
-        return ""
+            return message.content[0].text, message.stop_reason
+        return "", message.stop_reason
 
-    def _format_document_structure(self, structure: dict) -> str:
+    async def summarize_transcript(self, summary: str, new_text: str) -> str:
         """
-        Format document structure as a concise summary for the prompt.
+        Fold transcript text that aged out of the verbatim window into the summary.
 
-        Instead of sending full markdown, sends a structured overview
-        so Claude knows what sections exist and their purpose.
+        Uses the small summary model. On API errors the previous summary is
+        returned unchanged, so the prompt degrades to the old behavior of
+        simply dropping the oldest transcript.
         """
-        sections = structure.get("sections", [])
-        if not sections:
-            return "(Empty - this is a new session)"
+        try:
+            async with _claude_admission:
+                message = await self.client.messages.create(
+                    model=self.summary_model,
+                    max_tokens=self.summary_max_tokens,
+                    system=TRANSCRIPT_SUMMARY_SYSTEM_PROMPT,
+                    messages=[
+                        {"role": "user", "content": build_summary_prompt(summary, new_text)}
+                    ]
+                )
+        except anthropic.APIError:
+            logger.exception("Transcript summarization failed")
+            return summary
 
-        lines = ["Current document sections:"]
-        for section in sections:
-            title = section.get("title", "Untitled")
-            content = section.get("content", "")
-            subsections = section.get("subsections", [])
+        if message.content and message.content[0].text.strip():
+            return message.content[0].text.strip()
+        return summary
 
-            # Create a brief summary of content
-            content_preview = ""
-            if content:
-                # Show first 100 chars or first 2 bullet points
-                content_lines = content.strip().split('\n')[:2]
-                content_preview = " | ".join(line.strip()[:50] for line in content_lines if line.strip())
+    def _check_prefix_fingerprint(self, user_content: list[dict]) -> None:
+        """
+        Log when the cacheable prompt prefix differs from the previous call.
 
-            # Format section info
-            subsection_names = [s.get("title", "") for s in subsections if s.get("title")]
-            if subsection_names:
-                lines.append(f"- **{title}** (subsections: {', '.join(subsection_names)})")
-            else:
-                lines.append(f"- **{title}**")
+        The prefix legitimately changes when the document or transcript
+        grows, but a change every turn with no new content means the
+        formatting is drifting and prompt caching is silently missing.
+        """
+        digest = _SYSTEM_PROMPT_DIGEST.copy()
+        for block in user_content:
+            if "cache_control" not in block:
+                break
+            digest.update(block["text"].encode())
+        fingerprint = digest.hexdigest()
+
+        if self._prefix_fingerprint is not None and fingerprint != self._prefix_fingerprint:
+            logger.debug(
+                "Prompt prefix changed (%s -> %s), expect a cache write",
+                self._prefix_fingerprint[:12],
+                fingerprint[:12],
+            )
+        self._prefix_fingerprint = fingerprint
 
-            if content_preview:
-                lines.append(f"  Preview: {content_preview}...")
+    async def _parse_response(
+        self,
+        response_text: str,
+        keys: tuple[str, ...] = _RESPONSE_KEYS
+    ) -> AIResponse:
+        """
+        Parse Claude's response off the event loop.
 
-        return "\n".join(lines)
+        JSON extraction and question scanning are CPU work, so they run in
+        a worker thread to keep other sessions responsive.
+        """
+        return await asyncio.to_thread(self._parse_response_sync, response_text, keys)
 
-    def _parse_response(self, response_text: str) -> AIResponse:
+    def _parse_response_sync(
+        self,
+        response_text: str,
+        keys: tuple[str, ...] = _RESPONSE_KEYS
+    ) -> AIResponse:
         """
         Parse Claude's response into structured AIResponse.
 
-        Handles cases where response might not be valid JSON.
+        Handles cases where response might not be valid JSON. keys are the
+        ones the response's JSON object must have; missing fields default
+        to empty.
         """
         # Try to extract JSON from the response
-        json_str = self._extract_json(response_text)
+        json_str = self._extract_json(response_text, keys)
 
         if json_str:
             return AIResponse.from_json(json_str)
@@ -288,33 +762,35 @@ class AIProcessor:
                 raw_response=response_text
             )
 
-    def _extract_json(self, text: str) -> Optional[str]:
+    def _merge_responses(self, conversation: AIResponse, updates: AIResponse) -> AIResponse:
+        """Combine the results of the split conversation and update calls."""
+        return AIResponse(
+            conversation=conversation.conversation,
+            document_updates=updates.document_updates,
+            questions_asked=conversation.questions_asked,
+            raw_response=f"{conversation.raw_response}\n{updates.raw_response}"
+        )
+
+    def _extract_json(self, text: str, keys: tuple[str, ...] = _RESPONSE_KEYS) -> Optional[str]:
         """
         Extract JSON object from text.
 
         Handles cases where JSON might be wrapped in markdown code blocks
         or mixed with other text.
         """
-        # Try to find JSON in code blocks first
-        import re
-
-        # Look for ```json ... ``` blocks
-        json_block_pattern = r'```(?:json)?\s*(\{[\s\S]*?\})\s*```'
-        match = re.search(json_block_pattern, text)
-        if match:
-            return match.group(1)
-
-        # Try to find raw JSON object
-        json_pattern = r'\{[\s\S]*"conversation"[\s\S]*"document_updates"[\s\S]*\}'
-        match = re.search(json_pattern, text)
-        if match:
-            return match.group(0)
-
-        # Try parsing the whole text as JSON
+        # Skip any prose before a ```json fence so stray braces can't interfere
+        fence = text.find("```")
+        span = _find_json_span(text, fence, keys) if fence != -1 else None
+        if span is None:
+            span = _find_json_span(text, keys=keys)
+        if span:
+            return text[span[0]:span[1]]
+
+        # Try parsing the whole text as a JSON object
         try:
-            json.loads(text)
-            return text
-        except json.JSONDecodeError:
+            if isinstance(orjson.loads(text), dict):
+                return text
+        except orjson.JSONDecodeError:
             pass
 
         return None
@@ -335,7 +811,7 @@ class AIProcessor:
             document_updates=[
                 DocumentUpdate(
                     action="add_to_section",
-                    path="Unprocessed Thoughts",
+                    path=UNPROCESSED_THOUGHTS_SECTION,
                     content=f"- {thought}"
                 )
             ],
@@ -353,13 +829,26 @@ class ConversationContext:
 
     Keeps track of recent exchanges and pending questions to provide
     context to Claude. Tracks which questions have been answered.
+
+    Also keeps the recent transcript verbatim (up to TRANSCRIPT_MAX_CHARS);
+    older transcript text is evicted and folded into `summary`.
     """
 
+    # Cap on evicted text sent for one summarization pass (e.g. when a long
+    # session is resumed); anything older is only in the existing summary
+    MAX_SUMMARY_INPUT_CHARS = 8000
+
     def __init__(self, max_messages: int = 20):
         self.max_messages = max_messages
-        self.messages: list[dict] = []
-        self.pending_questions: list[PendingQuestion] = []
+        # Bounded deque evicts the oldest message on append
+        self.messages: deque[dict] = deque(maxlen=max_messages)
+        self.pending_questions: deque[PendingQuestion] = deque()
         self.answered_questions: list[PendingQuestion] = []
+        # Rolling transcript: summary of old text + verbatim recent tail
+        self.summary = ""
+        self.transcript_tail: deque[str] = deque()
+        self._tail_chars = 0
+        self._evicted_transcript: list[str] = []
 
     def add_user_message(self, content: str) -> None:
         """
@@ -371,7 +860,6 @@ class ConversationContext:
             "role": "user",
             "content": content
         })
-        self._trim_history()
 
         # Check if this response might answer pending questions
         self._check_for_answers(content)
@@ -388,7 +876,6 @@ class ConversationContext:
             "role": "assistant",
             "content": content
         })
-        self._trim_history()
 
         # Track new questions
         if questions:
@@ -398,6 +885,51 @@ class ConversationContext:
                     context=content[:100]  # Store brief context
                 ))
 
+    def add_transcript(self, text: str) -> bool:
+        """
+        Add finalized transcript text to the verbatim tail.
+
+        Returns True if older text was evicted and should be summarized
+        (see take_evicted_transcript).
+        """
+        self.transcript_tail.append(text)
+        self._tail_chars += len(text) + 1
+        evicted = False
+        # Always keep the newest piece, even if it alone exceeds the cap
+        while self._tail_chars > TRANSCRIPT_MAX_CHARS and len(self.transcript_tail) > 1:
+            old = self.transcript_tail.popleft()
+            self._tail_chars -= len(old) + 1
+            self._evicted_transcript.append(old)
+            evicted = True
+        return evicted
+
+    def take_evicted_transcript(self) -> str:
+        """Return (and clear) transcript text waiting to be summarized."""
+        text = " ".join(self._evicted_transcript)
+        self._evicted_transcript.clear()
+        return text[-self.MAX_SUMMARY_INPUT_CHARS:]
+
+    def get_transcript_tail(self) -> str:
+        """Get the recent transcript kept verbatim."""
+        return " ".join(self.transcript_tail)
+
+    def restore(self, messages: list[dict]) -> None:
+        """
+        Rebuild the context from persisted conversation history.
+
+        Replays the messages in order, so pending and answered questions
+        are reconstructed the same way they were during the original turns.
+        """
+        self.clear()
+        for message in messages:
+            if message["role"] == "user":
+                self.add_user_message(message["content"])
+            else:
+                self.add_assistant_message(
+                    message["content"],
+                    questions=AIResponse._extract_questions(message["content"])
+                )
+
     def _check_for_answers(self, user_message: str) -> None:
         """
         Check if the user's message might answer any pending questions.
@@ -413,21 +945,23 @@ class ConversationContext:
         # the most recent questions
         if len(user_message) > 20:
             # Mark up to 3 oldest pending questions as answered
-            questions_to_answer = min(3, len(self.pending_questions))
-            for _ in range(questions_to_answer):
-                if self.pending_questions:
-                    q = self.pending_questions.pop(0)
-                    q.answered = True
-                    q.answer = user_message[:200]  # Store brief answer reference
-                    self.answered_questions.append(q)
+            brief_answer = user_message[:200]  # Store brief answer reference
+            answered = [
+                self.pending_questions.popleft()
+                for _ in range(min(3, len(self.pending_questions)))
+            ]
+            for q in answered:
+                q.answered = True
+                q.answer = brief_answer
+            self.answered_questions.extend(answered)
 
         # Keep only recent answered questions for context
         if len(self.answered_questions) > 10:
-            self.answered_questions = self.answered_questions[-10:]
+            del self.answered_questions[:-10]
 
-    def get_recent_messages(self, count: int = 10) -> list[dict]:
-        """Get the most recent messages."""
-        return self.messages[-count:]
+    def get_recent_messages(self, count: int = RECENT_MESSAGE_WINDOW) -> list[dict]:
+        """Get the most recent messages (by default, the prompt's window)."""
+        return list(islice(self.messages, max(0, len(self.messages) - count), None))
 
     def get_pending_questions(self) -> list[str]:
         """Get list of questions that haven't been answered yet."""
@@ -453,11 +987,6 @@ class ConversationContext:
 
     def clear(self) -> None:
         """Clear all conversation history and questions."""
-        self.messages = []
-        self.pending_questions = []
+        self.messages.clear()
+        self.pending_questions.clear()
         self.answered_questions = []
-
-    def _trim_history(self) -> None:
-        """Trim history to max_messages."""
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages:]
@@ -22,6 +22,7 @@ Document Structure:
 """
 
 import json
+from collections import OrderedDict
 from typing import Optional
 from uuid import UUID
 from dataclasses import dataclass, field
@@ -43,6 +44,13 @@ class Section:
     title: str
     content: str = ""
     subsections: list["Section"] = field(default_factory=list)
+    # Cached markdown and dict for this section (top-level sections only)
+    _rendered: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _as_dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _title_key: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._title_key = self.title.casefold()
 
     def to_dict(self) -> dict:
         return {
@@ -51,6 +59,12 @@ class Section:
             "subsections": [s.to_dict() for s in self.subsections]
         }
 
+    def cached_dict(self) -> dict:
+        """Return to_dict(), reusing the cached result. Treat it as read-only."""
+        if self._as_dict is None:
+            self._as_dict = self.to_dict()
+        return self._as_dict
+
     @classmethod
     def from_dict(cls, data: dict) -> "Section":
         return cls(
@@ -61,6 +75,24 @@ class Section:
             ]
         )
 
+    def append_content(self, content: str) -> None:
+        """Append content on a new line."""
+        if self.content:
+            self.content += "\n" + content
+        else:
+            self.content = content
+
+    def render_markdown(self) -> str:
+        """Render this section and its subsections, reusing the cached result."""
+        if self._rendered is None:
+            body = f"\n{self.content}\n" if self.content else ""
+            subsections = "".join(
+                f"\n### {sub.title}\n" + (f"\n{sub.content}\n" if sub.content else "")
+                for sub in self.subsections
+            )
+            self._rendered = f"## {self.title}\n{body}{subsections}"
+        return self._rendered
+
 
 @dataclass
 class StructuredDocument:
@@ -68,14 +100,37 @@ class StructuredDocument:
     In-memory representation of the structured document.
 
     Provides methods for adding, updating, and rendering sections.
+    Rendered markdown and the dict form are cached per top-level section;
+    every mutator invalidates only the section it touched.
     """
     sections: list[Section] = field(default_factory=list)
+    _rendered: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _as_dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    # Case-insensitive lookups: title key -> Section, (section key, subsection key) -> Section
+    _index: dict[str, Section] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _sub_index: dict[tuple[str, str], Section] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        # setdefault keeps the first match, as the old linear scan did
+        for section in self.sections:
+            if self._index.setdefault(section._title_key, section) is not section:
+                continue
+            for sub in section.subsections:
+                self._sub_index.setdefault((section._title_key, sub._title_key), sub)
 
     def to_dict(self) -> dict:
         return {
             "sections": [s.to_dict() for s in self.sections]
         }
 
+    def cached_dict(self) -> dict:
+        """Return the document as a dict, reusing unchanged sections. Treat it as read-only."""
+        if self._as_dict is None:
+            self._as_dict = {"sections": [s.cached_dict() for s in self.sections]}
+        return self._as_dict
+
     @classmethod
     def from_dict(cls, data: dict) -> "StructuredDocument":
         return cls(
@@ -84,29 +139,40 @@ class StructuredDocument:
             ]
         )
 
+    def _invalidate(self, section: Optional[Section] = None) -> None:
+        """Drop cached markdown and dicts for a changed top-level section and the document."""
+        if section is not None:
+            section._rendered = None
+            section._as_dict = None
+        self._rendered = None
+        self._as_dict = None
+
     def find_section(self, title: str) -> Optional[Section]:
         """Find a top-level section by title."""
-        for section in self.sections:
-            if section.title.lower() == title.lower():
-                return section
-        return None
+        return self._index.get(title.casefold())
+
+    def _append_section(self, section: Section) -> Section:
+        self.sections.append(section)
+        self._index[section._title_key] = section
+        self._invalidate()
+        return section
+
+    def _append_subsection(self, section: Section, subsection: Section) -> Section:
+        section.subsections.append(subsection)
+        self._sub_index[(section._title_key, subsection._title_key)] = subsection
+        self._invalidate(section)
+        return subsection
 
     def find_or_create_section(self, title: str) -> Section:
         """Find a section or create it if it doesn't exist."""
         section = self.find_section(title)
         if section is None:
-            section = Section(title=title)
-            self.sections.append(section)
+            section = self._append_section(Section(title=title))
         return section
 
     def find_subsection(self, section_title: str, subsection_title: str) -> Optional[Section]:
         """Find a subsection within a section."""
-        section = self.find_section(section_title)
-        if section:
-            for subsection in section.subsections:
-                if subsection.title.lower() == subsection_title.lower():
-                    return subsection
-        return None
+        return self._sub_index.get((section_title.casefold(), subsection_title.casefold()))
 
     def add_section(self, title: str, content: str = "") -> Section:
         """Add a new top-level section."""
@@ -115,15 +181,11 @@ class StructuredDocument:
         if existing:
             # Add content to existing section
             if content:
-                if existing.content:
-                    existing.content += "\n" + content
-                else:
-                    existing.content = content
+                existing.append_content(content)
+                self._invalidate(existing)
             return existing
 
-        section = Section(title=title, content=content)
-        self.sections.append(section)
-        return section
+        return self._append_section(Section(title=title, content=content))
 
     def add_to_section(self, path: str, content: str) -> bool:
         """
@@ -136,30 +198,21 @@ class StructuredDocument:
         if len(parts) == 1:
             # Adding to top-level section
             section = self.find_or_create_section(parts[0])
-            if section.content:
-                section.content += "\n" + content
-            else:
-                section.content = content
+            section.append_content(content)
+            self._invalidate(section)
             return True
 
         elif len(parts) == 2:
             # Adding to subsection
             section = self.find_or_create_section(parts[0])
-            subsection = None
-            for sub in section.subsections:
-                if sub.title.lower() == parts[1].lower():
-                    subsection = sub
-                    break
+            subsection = self._sub_index.get((section._title_key, parts[1].casefold()))
 
             if subsection is None:
                 # Create subsection
-                subsection = Section(title=parts[1], content=content)
-                section.subsections.append(subsection)
+                self._append_subsection(section, Section(title=parts[1], content=content))
             else:
-                if subsection.content:
-                    subsection.content += "\n" + content
-                else:
-                    subsection.content = content
+                subsection.append_content(content)
+                self._invalidate(section)
             return True
 
         return False
@@ -177,63 +230,66 @@ class StructuredDocument:
         section = self.find_or_create_section(parts[0])
 
         # Check if subsection already exists
-        for sub in section.subsections:
-            if sub.title.lower() == parts[1].lower():
-                # Add to existing subsection
-                if sub.content:
-                    sub.content += "\n" + content
-                else:
-                    sub.content = content
-                return True
+        existing = self._sub_index.get((section._title_key, parts[1].casefold()))
+        if existing is not None:
+            # Add to existing subsection
+            existing.append_content(content)
+            self._invalidate(section)
+            return True
 
         # Create new subsection
-        subsection = Section(title=parts[1], content=content)
-        section.subsections.append(subsection)
+        self._append_subsection(section, Section(title=parts[1], content=content))
         return True
 
     def add_action_item(self, content: str) -> bool:
         """Add an action item to the Action Items section."""
         section = self.find_or_create_section("Action Items")
         item = f"- [ ] {content}" if not content.startswith("-") else content
-        if section.content:
-            section.content += "\n" + item
-        else:
-            section.content = item
+        section.append_content(item)
+        self._invalidate(section)
         return True
 
     def add_blocker(self, content: str) -> bool:
         """Add a blocker to the Blockers & Open Questions section."""
         section = self.find_or_create_section("Blockers & Open Questions")
         item = f"- {content}" if not content.startswith("-") else content
-        if section.content:
-            section.content += "\n" + item
-        else:
-            section.content = item
+        section.append_content(item)
+        self._invalidate(section)
         return True
 
     def render_markdown(self) -> str:
         """Render the document as markdown."""
-        lines = []
+        if self._rendered is None:
+            self._rendered = "\n".join(
+                section.render_markdown() for section in self.sections
+            )
+        return self._rendered
 
-        for section in self.sections:
-            # Section header
-            lines.append(f"## {section.title}")
-            lines.append("")
-
-            # Section content
-            if section.content:
-                lines.append(section.content)
-                lines.append("")
-
-            # Subsections
-            for subsection in section.subsections:
-                lines.append(f"### {subsection.title}")
-                lines.append("")
-                if subsection.content:
-                    lines.append(subsection.content)
-                    lines.append("")
 
-        return "\n".join(lines)
+# Markdown rendered from stored documents, keyed by (id, updated_at) so any
+# committed change to a document misses the cache
+_MARKDOWN_CACHE_SIZE = 256
+_markdown_cache: OrderedDict[tuple, str] = OrderedDict()
+
+
+def render_document_markdown(document: Document) -> str:
+    """
+    Render a stored document's markdown from its JSONB content.
+
+    Markdown is derived data and is no longer written on every update, so
+    read paths render it on demand.
+    """
+    key = (document.id, document.updated_at)
+    if document.updated_at is not None and key in _markdown_cache:
+        _markdown_cache.move_to_end(key)
+        return _markdown_cache[key]
+
+    markdown = StructuredDocument.from_dict(document.content or {"sections": []}).render_markdown()
+    if document.updated_at is not None:
+        _markdown_cache[key] = markdown
+        if len(_markdown_cache) > _MARKDOWN_CACHE_SIZE:
+            _markdown_cache.popitem(last=False)
+    return markdown
 
 
 class DocumentManager:
@@ -248,6 +304,9 @@ class DocumentManager:
         self.db_session = db_session
         self.document_id: Optional[UUID] = None
         self.structured_doc: Optional[StructuredDocument] = None
+        # Bumped on every applied batch of updates, so clients mirroring the
+        # document from update deltas can detect a missed change
+        self.doc_version = 0
 
     async def load_or_create_document(
         self,
@@ -277,18 +336,22 @@ class DocumentManager:
         """
         Apply a list of document updates.
 
+        The save is staged on the database session; the caller commits it
+        along with the rest of the turn.
+
         Returns True if all updates were applied successfully.
         """
         if self.structured_doc is None:
             return False
 
+        self.doc_version += 1
         success = True
         for update in updates:
             result = self._apply_single_update(update)
             if not result:
                 success = False
 
-        # Save to database after applying updates
+        # Stage the save after applying updates
         await self._save_document()
 
         return success
@@ -321,18 +384,14 @@ class DocumentManager:
             return self.structured_doc.add_to_section(update.path, update.content)
 
     async def _save_document(self) -> None:
-        """Save the current document state to the database."""
+        """Stage the current document state on the database session."""
         if self.document_id is None or self.structured_doc is None:
             return
 
-        content = self.structured_doc.to_dict()
-        markdown = self.structured_doc.render_markdown()
-
         await update_document(
             self.db_session,
             self.document_id,
-            content=content,
-            markdown=markdown,
+            content=self.structured_doc.cached_dict(),
             save_version=True
         )
 
@@ -346,7 +405,7 @@ class DocumentManager:
         """Get the current document structure as dict."""
         if self.structured_doc is None:
             return {"sections": []}
-        return self.structured_doc.to_dict()
+        return self.structured_doc.cached_dict()
 
     async def export_markdown(self) -> str:
         """
@@ -18,8 +18,8 @@ CREATE TABLE IF NOT EXISTS documents (
 CREATE TABLE IF NOT EXISTS document_versions (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     document_id UUID REFERENCES documents(id) ON DELETE CASCADE,
+    kind VARCHAR(10) DEFAULT 'snapshot',  -- 'snapshot' (full content), 'patch' (reverse JSON Patch) or 'resync' (snapshot after a lost version)
     content JSONB,
-    markdown TEXT,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -40,14 +40,26 @@ CREATE TABLE IF NOT EXISTS conversations (
     session_id UUID REFERENCES sessions(id) ON DELETE CASCADE,
     role VARCHAR(20) NOT NULL,
     content TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT clock_timestamp(),
+    seq BIGINT GENERATED BY DEFAULT AS IDENTITY
+);
+
+-- Session transcripts, stored append-only
+CREATE TABLE IF NOT EXISTS transcript_chunks (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    session_id UUID NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    content TEXT NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
 -- Create indexes for common queries
-CREATE INDEX IF NOT EXISTS idx_documents_user_id ON documents(user_id);
-CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id);
+CREATE INDEX IF NOT EXISTS ix_documents_user_updated ON documents(user_id, updated_at DESC);
+CREATE INDEX IF NOT EXISTS ix_documents_content_gin ON documents USING gin (content jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS ix_sessions_user_started ON sessions(user_id, started_at DESC);
 CREATE INDEX IF NOT EXISTS idx_sessions_document_id ON sessions(document_id);
-CREATE INDEX IF NOT EXISTS idx_conversations_session_id ON conversations(session_id);
+CREATE INDEX IF NOT EXISTS ix_conv_session_created_seq_desc ON conversations(session_id, created_at DESC, seq DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_transcript_chunks_session_seq ON transcript_chunks(session_id, seq);
 CREATE INDEX IF NOT EXISTS idx_document_versions_document_id ON document_versions(document_id);
 
 -- Function to update the updated_at timestamp
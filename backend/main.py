@@ -10,7 +10,7 @@ Handles:
 WebSocket Flow:
 1. Client connects to /ws endpoint
 2. Client sends "start_session" message to begin
-3. Client streams audio chunks (base64 encoded)
+3. Client streams audio chunks (binary WebSocket frames)
 4. Backend transcribes audio and returns transcript chunks
 5. Backend detects pauses and triggers AI processing
 6. Backend returns AI response and document updates
@@ -18,24 +18,33 @@ WebSocket Flow:
 """
 
 import os
-import json
+import re
 import asyncio
-import base64
 import logging
+import logging.handlers
+import queue
 from typing import Optional
+from urllib.parse import quote
 from uuid import UUID
 from contextlib import asynccontextmanager
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
 
-# Configure logging
+# Configure logging - records go through a queue and are written by a
+# background listener thread, so log I/O never blocks the event loop
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
 logger = logging.getLogger(__name__)
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
@@ -43,24 +52,36 @@ from dotenv import load_dotenv
 
 from database import (
     AsyncSessionLocal,
+    engine,
+    wait_for_version_saves,
     init_db,
     create_session,
     end_session,
     get_session,
-    update_session_transcript,
-    add_conversation,
+    reopen_session,
+    append_transcript_chunks,
+    get_transcript_chunks,
+    persist_turn,
     get_session_conversations,
     get_document,
-    get_user_documents,
+    get_document_version,
+    get_user_documents_summary,
 )
 from transcription import (
+    close_openai_client,
     get_transcription_provider,
     TranscriptionProvider,
     TranscriptionResult,
     PauseDetector,
 )
-from ai_processor import AIProcessor, ConversationContext, AIResponse
-from document_manager import DocumentManager
+from ai_processor import (
+    AIProcessor,
+    ConversationContext,
+    AIResponse,
+    close_anthropic_client,
+    format_document_structure,
+)
+from document_manager import DocumentManager, StructuredDocument, render_document_markdown
 
 load_dotenv()
 
@@ -68,6 +89,10 @@ load_dotenv()
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", 8000))
 PAUSE_THRESHOLD_MS = int(os.getenv("PAUSE_THRESHOLD_MS", 2000))
+OUTBOX_MAX_BATCH = 64  # Max messages coalesced into one WebSocket frame
+MAX_AUDIO_FRAME_BYTES = 256 * 1024  # Far above a 250ms opus chunk
+TRANSCRIPT_DRAIN_TIMEOUT = 2.0  # Seconds to forward results left after transcription closes
+AI_DRAIN_TIMEOUT = 30.0  # Seconds to let queued AI turns finish when a session ends
 
 
 @asynccontextmanager
@@ -80,7 +105,7 @@ async def lifespan(app: FastAPI):
 
     # Log environment for debugging
     db_url = os.getenv("DATABASE_URL", "")
-    logger.info(f"Starting app with DATABASE_URL set: {bool(db_url)}")
+    logger.info("Starting app with DATABASE_URL set: %s", bool(db_url))
     if "localhost" in db_url or "127.0.0.1" in db_url:
         logger.warning("DATABASE_URL contains localhost - this won't work on Railway!")
         logger.warning("Please use Railway's PostgreSQL reference variable")
@@ -92,17 +117,22 @@ async def lifespan(app: FastAPI):
             break
         except Exception as e:
             if attempt < max_retries - 1:
-                logger.warning(f"Database connection failed (attempt {attempt + 1}/{max_retries}): {e}")
-                logger.info(f"Retrying in {retry_delay} seconds...")
+                logger.warning("Database connection failed (attempt %d/%d): %s", attempt + 1, max_retries, e)
+                logger.info("Retrying in %s seconds...", retry_delay)
                 await asyncio.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
             else:
-                logger.error(f"Could not connect to database after {max_retries} attempts: {e}")
+                logger.error("Could not connect to database after %d attempts: %s", max_retries, e)
                 logger.warning("App will start but database features may not work")
 
     yield
-    # Shutdown: Cleanup if needed
+    # Shutdown: release pooled API connections
     logger.info("Shutting down")
+    await close_anthropic_client()
+    await close_openai_client()
+    await wait_for_version_saves()
+    await engine.dispose()
+    _log_listener.stop()
 
 
 app = FastAPI(
@@ -145,9 +175,11 @@ class DocumentResponse(BaseModel):
     structure: dict
 
 
-class ExportResponse(BaseModel):
+class DocumentVersionResponse(BaseModel):
+    id: str
+    versions_back: int
     markdown: str
-    filename: str
+    structure: dict
 
 
 # ============================================================================
@@ -198,7 +230,7 @@ async def list_documents(
     db: AsyncSession = Depends(get_db)
 ):
     """List all documents for a user."""
-    documents = await get_user_documents(db, user_id)
+    documents = await get_user_documents_summary(db, user_id)
     return [
         {
             "id": str(doc.id),
@@ -211,41 +243,77 @@ async def list_documents(
 
 @app.get("/api/documents/{document_id}")
 async def get_document_api(
-    document_id: str,
+    document_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific document by ID."""
-    doc = await get_document(db, UUID(document_id))
+    doc = await get_document(db, document_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
     return DocumentResponse(
         id=str(doc.id),
         title=doc.title,
-        markdown=doc.markdown or "",
+        markdown=render_document_markdown(doc),
         structure=doc.content or {"sections": []}
     )
 
 
+@app.get("/api/documents/{document_id}/versions/{versions_back}")
+async def get_document_version_api(
+    document_id: UUID,
+    versions_back: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a document as it was versions_back saves ago (0 is the current state)."""
+    content = await get_document_version(db, document_id, versions_back)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Document version not found")
+
+    return DocumentVersionResponse(
+        id=str(document_id),
+        versions_back=versions_back,
+        markdown=StructuredDocument.from_dict(content).render_markdown(),
+        structure=content
+    )
+
+
+# Anything but letters, digits, spaces, hyphens and underscores (\w is
+# exactly str.isalnum() plus "_")
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]")
+
+
 @app.get("/api/documents/{document_id}/export")
 async def export_document(
-    document_id: str,
+    document_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
-    """Export a document as markdown."""
-    doc = await get_document(db, UUID(document_id))
+    """Export a document as a raw markdown download."""
+    doc = await get_document(db, document_id)
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # Build export markdown
     title = doc.title or "My Thinking Session"
-    markdown = f"# {title}\n\n*Exported from Thinking Partner*\n\n---\n\n{doc.markdown or ''}"
 
     # Generate filename
-    safe_title = "".join(c if c.isalnum() or c in " -_" else "" for c in title)
-    filename = f"{safe_title.strip().replace(' ', '_')}.md"
-
-    return ExportResponse(markdown=markdown, filename=filename)
+    stem = _UNSAFE_FILENAME_CHARS.sub("", title).strip().replace(" ", "_")
+    filename = f"{stem or 'notes'}.md"
+    # Plain filename for old clients, RFC 5987 form for non-ASCII titles
+    ascii_stem = stem.encode("ascii", "ignore").decode()
+    ascii_filename = f"{ascii_stem}.md" if ascii_stem.strip("_-") else "notes.md"
+
+    # The markdown is rendered (and cached) whole, so send it in one body
+    content = f"# {title}\n\n*Exported from Thinking Partner*\n\n---\n\n{render_document_markdown(doc)}"
+    return Response(
+        content,
+        media_type="text/markdown; charset=utf-8",
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{ascii_filename}"; '
+                f"filename*=UTF-8''{quote(filename)}"
+            )
+        },
+    )
 
 
 # ============================================================================
@@ -275,7 +343,13 @@ class SessionHandler:
         self.session_id: Optional[UUID] = None
         self.document_id: Optional[UUID] = None
         self.is_active = False
-        self.full_transcript = ""
+        # Finalized transcript pieces; joined only when the text is needed
+        self._transcript_chunks: list[str] = []
+        # Finalized transcript text not yet written, and the next chunk seq
+        self._pending_transcript: list[str] = []
+        self._transcript_seq = 0
+        # Interim text of the current utterance as last sent to the client
+        self._last_partial = ""
 
         # Components
         self.transcription_provider: Optional[TranscriptionProvider] = None
@@ -286,28 +360,84 @@ class SessionHandler:
 
         # Background tasks
         self.transcript_task: Optional[asyncio.Task] = None
+        self._summary_task: Optional[asyncio.Task] = None
+        self._ai_task: Optional[asyncio.Task] = None
+
+        # Thoughts waiting for the AI worker. At most one is pending; a thought
+        # arriving while one waits is merged into it, so a slow AI turn can't
+        # pile up requests behind it.
+        self._thought_queue: asyncio.Queue[str] = asyncio.Queue(maxsize=1)
+
+        # Outbound messages, coalesced into one frame per writer wakeup
+        self._outbox: asyncio.Queue[Optional[dict]] = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_outbox())
 
-    async def start_session(self, document_id: Optional[str] = None) -> dict:
+    async def start_session(
+        self,
+        document_id: Optional[str] = None,
+        session_id: Optional[str] = None
+    ) -> dict:
         """
-        Start a new thinking session.
+        Start a new thinking session, or resume an existing one.
 
-        Creates database records and initializes all components.
+        Creates database records and initializes all components. When a
+        session_id is given (e.g. after a reconnect, possibly to another
+        worker), the conversation context and transcript are restored from
+        the database instead of starting fresh.
         """
+        # Look up the session being resumed, if any
+        existing = None
+        if session_id:
+            existing = await reopen_session(self.db_session, UUID(session_id))
+            if existing and existing.document_id:
+                document_id = str(existing.document_id)
+
         # Initialize document manager
         self.document_manager = DocumentManager(self.db_session)
         doc_uuid = UUID(document_id) if document_id else None
         self.document_id = await self.document_manager.load_or_create_document(doc_uuid)
 
-        # Create session in database
-        session = await create_session(
-            self.db_session,
-            document_id=self.document_id
-        )
-        self.session_id = session.id
+        if existing:
+            self.session_id = existing.id
+            chunks = await get_transcript_chunks(self.db_session, existing.id)
+            if chunks:
+                self._transcript_chunks = [content for _, content in chunks]
+                # Seqs can have gaps, so continue after the highest one
+                self._transcript_seq = chunks[-1][0] + 1
+            elif existing.transcript:
+                # Migrate a transcript saved before chunking as chunk 0
+                self._append_transcript(existing.transcript)
+        else:
+            # Create session in database
+            session = await create_session(
+                self.db_session,
+                document_id=self.document_id
+            )
+            self.session_id = session.id
 
         # Initialize AI processor
         self.ai_processor = AIProcessor()
         self.conversation_context = ConversationContext()
+        if existing:
+            conversations = await get_session_conversations(
+                self.db_session,
+                existing.id,
+                limit=self.conversation_context.max_messages
+            )
+            self.conversation_context.restore([
+                {"role": c.role, "content": c.content}
+                for c in conversations
+            ])
+
+        # Seed the verbatim transcript window; older text gets summarized
+        evicted = False
+        for chunk in self._transcript_chunks:
+            evicted = self.conversation_context.add_transcript(chunk) or evicted
+        if evicted:
+            self._schedule_transcript_summary()
+
+        # One AI turn at a time per session
+        self._ai_task = asyncio.create_task(self._ai_worker())
 
         # Initialize pause detector
         self.pause_detector = PauseDetector(
@@ -324,7 +454,7 @@ class SessionHandler:
             # Start transcript receiving task
             self.transcript_task = asyncio.create_task(self._receive_transcripts())
         except Exception as e:
-            logger.warning(f"Failed to start transcription: {e}")
+            logger.warning("Failed to start transcription: %s", e)
             # Continue without transcription - can still type thoughts
 
         self.is_active = True
@@ -334,6 +464,8 @@ class SessionHandler:
             "session_id": str(self.session_id),
             "document_id": str(self.document_id),
             "document": self.document_manager.get_markdown(),
+            "structure": self.document_manager.get_structure(),
+            "doc_version": self.document_manager.doc_version,
         }
 
     async def end_session(self) -> dict:
@@ -342,31 +474,54 @@ class SessionHandler:
 
         Saves final state and cleans up resources.
         """
+        # Stop taking input and new thoughts first; pending pause callbacks
+        # check this. Thoughts already queued still get their turn below.
         self.is_active = False
 
         # Stop pause detector
         if self.pause_detector:
             self.pause_detector.stop()
 
-        # Close transcription
+        if self._summary_task:
+            self._summary_task.cancel()
+
+        # Close transcription while the transcript task still runs, so the
+        # final results returned during close are added to the transcript.
+        # The task exits once the provider's results run out.
         if self.transcription_provider:
             await self.transcription_provider.close()
-
-        # Cancel transcript task
         if self.transcript_task:
-            self.transcript_task.cancel()
             try:
-                await self.transcript_task
+                await asyncio.wait_for(self.transcript_task, timeout=TRANSCRIPT_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Transcript task didn't finish within %.1fs of closing transcription",
+                    TRANSCRIPT_DRAIN_TIMEOUT
+                )
+
+        # Let the AI worker finish the turn in progress and the thought
+        # queued behind it, so their replies and document updates are saved.
+        # It is only stopped after that, before the database work below.
+        if self._ai_task:
+            drained = True
+            try:
+                await asyncio.wait_for(self._thought_queue.join(), timeout=AI_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("AI turns didn't finish within %.1fs, cancelling", AI_DRAIN_TIMEOUT)
+                drained = False
+            self._ai_task.cancel()
+            try:
+                await self._ai_task
             except asyncio.CancelledError:
                 pass
+            if not drained:
+                # The cancelled turn may have stopped partway through its
+                # transaction; start the session's own writes from a clean one
+                await self.db_session.rollback()
 
-        # Save final transcript
+        # Save remaining transcript
         if self.session_id:
-            await update_session_transcript(
-                self.db_session,
-                self.session_id,
-                self.full_transcript
-            )
+            await self._stage_transcript()
             await end_session(self.db_session, self.session_id)
 
         # Get final document
@@ -389,6 +544,11 @@ class SessionHandler:
         if self.transcription_provider and self.is_active:
             await self.transcription_provider.send_audio(audio_data)
 
+    def flush_transcription(self) -> None:
+        """Pass a pause in speech reported by the client to the provider."""
+        if self.transcription_provider and self.is_active:
+            self.transcription_provider.flush()
+
     async def process_text_input(self, text: str) -> None:
         """
         Process direct text input (for testing or typing mode).
@@ -399,52 +559,58 @@ class SessionHandler:
             return
 
         # Add to transcript
-        self.full_transcript += f" {text}" if self.full_transcript else text
+        self._append_transcript(text)
 
         # Send transcript update to client
-        await self._send_message({
+        await self.send_message({
             "type": "transcript",
             "text": text,
             "is_final": True,
         })
 
         # Process with AI
-        await self._process_with_ai(text)
+        self._queue_thought(text)
 
     async def _receive_transcripts(self) -> None:
         """
         Background task to receive and process transcripts.
 
         Receives transcription results and forwards to pause detector.
+        Runs until the provider's results end, which happens once it is
+        closed.
         """
         if not self.transcription_provider:
             return
 
         try:
             async for result in self.transcription_provider.receive_transcripts():
-                if not self.is_active:
-                    break
-
-                # Send transcript to client
-                await self._send_message({
-                    "type": "transcript",
-                    "text": result.text,
-                    "is_final": result.is_final,
-                })
+                # Interim results repeat the utterance so far; send only the
+                # new suffix, or the whole text with reset when it was revised
+                text = result.text
+                reset = not text.startswith(self._last_partial)
+                delta = text if reset else text[len(self._last_partial):]
+                if delta or reset or result.is_final:
+                    await self.send_message({
+                        "type": "transcript_delta",
+                        "delta": delta,
+                        "reset": reset,
+                        "is_final": result.is_final,
+                    })
+                self._last_partial = "" if result.is_final else text
 
                 # Update full transcript with final results
                 if result.is_final:
-                    self.full_transcript += f" {result.text}" if self.full_transcript else result.text
+                    self._append_transcript(result.text)
 
                 # Feed to pause detector
                 if self.pause_detector:
                     await self.pause_detector.on_transcript(result)
 
-        except asyncio.CancelledError:
-            pass
         except Exception as e:
-            logger.error(f"Error receiving transcripts: {e}")
-            await self._send_message({
+            if not self.is_active:
+                return
+            logger.error("Error receiving transcripts: %s", e)
+            await self.send_message({
                 "type": "error",
                 "message": "Transcription error occurred",
             })
@@ -458,12 +624,32 @@ class SessionHandler:
         if not self.is_active or not transcript.strip():
             return
 
-        await self._send_message({
+        await self.send_message({
             "type": "pause_detected",
             "transcript": transcript,
         })
 
-        await self._process_with_ai(transcript)
+        self._queue_thought(transcript)
+
+    def _queue_thought(self, thought: str) -> None:
+        """Hand a thought to the AI worker, merging it into one already waiting."""
+        try:
+            self._thought_queue.put_nowait(thought)
+        except asyncio.QueueFull:
+            pending = self._thought_queue.get_nowait()
+            # The merged thought is counted again by put_nowait
+            self._thought_queue.task_done()
+            self._thought_queue.put_nowait(f"{pending} {thought}")
+
+    async def _ai_worker(self) -> None:
+        """Background task processing queued thoughts one at a time."""
+        while True:
+            thought = await self._thought_queue.get()
+            try:
+                await self._process_with_ai(thought)
+            finally:
+                # end_session waits on join() for queued thoughts
+                self._thought_queue.task_done()
 
     async def _process_with_ai(self, thought: str) -> None:
         """
@@ -476,15 +662,16 @@ class SessionHandler:
             return
 
         # Notify client processing started
-        await self._send_message({
+        await self.send_message({
             "type": "processing",
             "status": "started",
         })
 
+        staged: list[str] = []
         try:
             # Get current document structure (more efficient than full markdown)
-            current_doc = self.document_manager.get_markdown()
             doc_structure = self.document_manager.get_structure()
+            current_doc = format_document_structure(doc_structure)
             recent_convos = self.conversation_context.get_recent_messages() if self.conversation_context else []
 
             # Get question tracking context
@@ -492,14 +679,23 @@ class SessionHandler:
             if self.conversation_context:
                 question_context = self.conversation_context.get_question_context()
 
-            # Process with AI - include question context, document structure, and full transcript
+            # Recent transcript verbatim plus a summary of everything older
+            if self.conversation_context:
+                transcript = self.conversation_context.get_transcript_tail()
+                transcript_summary = self.conversation_context.summary
+            else:
+                transcript = self.full_transcript
+                transcript_summary = None
+
+            # Process with AI - include question context, document structure, and transcript
             response = await self.ai_processor.process_thought(
                 new_thought=thought,
                 current_document=current_doc,
                 recent_conversations=recent_convos,
                 question_context=question_context,
-                document_structure=doc_structure,
-                full_transcript=self.full_transcript
+                full_transcript=transcript,
+                transcript_summary=transcript_summary,
+                on_conversation_delta=self._send_conversation_delta
             )
 
             # Update conversation context with extracted questions
@@ -510,18 +706,13 @@ class SessionHandler:
                     questions=response.questions_asked
                 )
 
-            # Save conversation to database
-            if self.session_id:
-                await add_conversation(self.db_session, self.session_id, "user", thought)
-                await add_conversation(self.db_session, self.session_id, "assistant", response.conversation)
-
-            # Apply document updates
+            # Apply document updates (staged, committed with the turn after sending)
             if response.document_updates:
                 await self.document_manager.apply_updates(response.document_updates)
 
             # Send response to client (include pending questions for visibility)
             pending_questions = self.conversation_context.get_pending_questions() if self.conversation_context else []
-            await self._send_message({
+            await self.send_message({
                 "type": "ai_response",
                 "conversation": response.conversation,
                 "document_updates": [
@@ -532,35 +723,211 @@ class SessionHandler:
                     }
                     for u in response.document_updates
                 ],
-                "updated_document": self.document_manager.get_markdown(),
+                # Clients apply document_updates to their own copy; the full
+                # document is only sent on start and on get_document resyncs
+                "doc_version": self.document_manager.doc_version,
                 "pending_questions": pending_questions,
             })
 
+            # Save conversation, transcript and document changes in one
+            # transaction. The response above is only queued, so the outbox
+            # writer delivers it while this commit is in flight.
+            if self.session_id:
+                staged = await self._stage_transcript()
+                await persist_turn(self.db_session, self.session_id, thought, response.conversation)
+            else:
+                await self.db_session.commit()
+
         except Exception as e:
-            logger.error(f"AI processing error: {e}")
-            await self._send_message({
+            logger.error("AI processing error: %s", e)
+            # Clear the failed transaction so later turns can use the session,
+            # and write the transcript it held again with the next one
+            await self.db_session.rollback()
+            self._restore_transcript(staged)
+            await self.send_message({
                 "type": "error",
                 "message": "AI processing error occurred",
             })
 
         finally:
-            await self._send_message({
+            await self.send_message({
                 "type": "processing",
                 "status": "completed",
             })
 
-    async def _send_message(self, message: dict) -> None:
-        """Send a JSON message to the WebSocket client."""
+    @property
+    def full_transcript(self) -> str:
+        """The session transcript so far."""
+        return " ".join(self._transcript_chunks)
+
+    def _append_transcript(self, text: str) -> None:
+        """Add finalized text to the transcript and queue it for saving."""
+        self._transcript_chunks.append(text)
+        self._pending_transcript.append(text)
+        if self.conversation_context and self.conversation_context.add_transcript(text):
+            self._schedule_transcript_summary()
+
+    def _schedule_transcript_summary(self) -> None:
+        """Start folding evicted transcript into the summary, if not already running."""
+        if self._summary_task is None or self._summary_task.done():
+            self._summary_task = asyncio.create_task(self._roll_transcript_summary())
+
+    async def _roll_transcript_summary(self) -> None:
+        """Summarize evicted transcript text until none is left."""
+        context = self.conversation_context
+        while self.ai_processor and context:
+            evicted = context.take_evicted_transcript()
+            if not evicted:
+                return
+            context.summary = await self.ai_processor.summarize_transcript(context.summary, evicted)
+
+    async def _stage_transcript(self) -> list[str]:
+        """
+        Stage queued transcript text as new chunks (committed by the caller).
+
+        Returns the staged chunks, to pass to _restore_transcript if the
+        caller's commit fails.
+        """
+        if not self._pending_transcript:
+            return []
+        chunks, self._pending_transcript = self._pending_transcript, []
+        seq = self._transcript_seq
+        self._transcript_seq += len(chunks)
         try:
-            await self.websocket.send_json(message)
-        except Exception as e:
-            logger.debug(f"Error sending WebSocket message: {e}")
+            await append_transcript_chunks(self.db_session, self.session_id, seq, chunks)
+        except Exception:
+            self._restore_transcript(chunks)
+            raise
+        return chunks
+
+    def _restore_transcript(self, chunks: list[str]) -> None:
+        """Queue chunks from a rolled-back transaction to be written again."""
+        if chunks:
+            self._pending_transcript[:0] = chunks
+            self._transcript_seq -= len(chunks)
+
+    async def _send_conversation_delta(self, text: str) -> None:
+        """Forward streamed conversation text to the client as it arrives."""
+        await self.send_message({
+            "type": "ai_response_delta",
+            "text": text,
+        })
+
+    async def send_message(self, message: dict) -> None:
+        """Queue a JSON message for the WebSocket client."""
+        self._outbox.put_nowait(message)
+
+    async def close_outbox(self) -> None:
+        """Flush queued messages and stop the writer."""
+        self._outbox.put_nowait(None)
+        await self._writer_task
+
+    async def _write_outbox(self) -> None:
+        """
+        Background writer for queued messages.
+
+        Messages queued while the previous frame was being sent (or in the
+        same event-loop turn) go out together as one
+        {"type": "batch", "messages": [...]} frame.
+        """
+        closing = False
+        while not closing:
+            message = await self._outbox.get()
+            if message is None:
+                return
+
+            batch = [message]
+            while len(batch) < OUTBOX_MAX_BATCH and not self._outbox.empty():
+                queued = self._outbox.get_nowait()
+                if queued is None:
+                    closing = True
+                    break
+                batch.append(queued)
+
+            payload = batch[0] if len(batch) == 1 else {"type": "batch", "messages": batch}
+            try:
+                await self.websocket.send_text(orjson.dumps(payload).decode())
+            except Exception as e:
+                logger.debug("Error sending WebSocket message: %s", e)
 
 
 # ============================================================================
 # WebSocket Endpoint
 # ============================================================================
 
+# Control message handlers. Each handler takes the session handler and the decoded message and returns
+# True when the connection loop should stop.
+
+async def _handle_start_session(handler: SessionHandler, data: dict) -> bool:
+    """Start a new session, or resume one after a reconnect."""
+    if handler.is_active:
+        # A second worker would share the connection's database session
+        await handler.send_message({
+            "type": "error",
+            "message": "Session already started",
+        })
+        return False
+    response = await handler.start_session(data.get("document_id"), data.get("session_id"))
+    await handler.send_message(response)
+    return False
+
+
+async def _handle_text(handler: SessionHandler, data: dict) -> bool:
+    """Process direct text input with validation."""
+    content = data.get("content", "")
+    if not content:
+        return False
+    # Validate input length (max 10KB of text)
+    if len(content) > 10000:
+        await handler.send_message({
+            "type": "error",
+            "message": "Text input too long (max 10,000 characters)",
+        })
+        return False
+    await handler.process_text_input(content)
+    return False
+
+
+async def _handle_end_session(handler: SessionHandler, data: dict) -> bool:
+    """End the session and close the connection loop."""
+    response = await handler.end_session()
+    await handler.send_message(response)
+    return True
+
+
+async def _handle_get_document(handler: SessionHandler, data: dict) -> bool:
+    """Send the current document state (clients render markdown from the structure)."""
+    if handler.document_manager:
+        await handler.send_message({
+            "type": "document",
+            "structure": handler.document_manager.get_structure(),
+            "doc_version": handler.document_manager.doc_version,
+        })
+    return False
+
+
+async def _handle_speech_pause(handler: SessionHandler, data: dict) -> bool:
+    """Client detected silence after speech; transcribe without waiting."""
+    handler.flush_transcription()
+    return False
+
+
+async def _handle_ping(handler: SessionHandler, data: dict) -> bool:
+    """Keep-alive ping."""
+    await handler.send_message({"type": "pong"})
+    return False
+
+
+MESSAGE_HANDLERS = {
+    "start_session": _handle_start_session,
+    "text": _handle_text,
+    "end_session": _handle_end_session,
+    "get_document": _handle_get_document,
+    "speech_pause": _handle_speech_pause,
+    "ping": _handle_ping,
+}
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -568,8 +935,10 @@ async def websocket_endpoint(websocket: WebSocket):
 
     Protocol:
     - Client connects and sends {"type": "start_session"} or {"type": "start_session", "document_id": "..."}
-    - Client streams audio as {"type": "audio", "data": "<base64>"} or sends text {"type": "text", "content": "..."}
+      (or {"type": "start_session", "session_id": "..."} to resume after a reconnect)
+    - Client streams audio as raw binary frames or sends text {"type": "text", "content": "..."}
     - Server responds with transcript updates, AI responses, and document updates
+    - Server messages sent close together arrive as {"type": "batch", "messages": [...]}
     - Client sends {"type": "end_session"} to finish
     """
     await websocket.accept()
@@ -581,76 +950,62 @@ async def websocket_endpoint(websocket: WebSocket):
         try:
             while True:
                 # Receive message from client
-                data = await websocket.receive_json()
-                msg_type = data.get("type")
-
-                if msg_type == "start_session":
-                    # Start a new session
-                    document_id = data.get("document_id")
-                    response = await handler.start_session(document_id)
-                    await websocket.send_json(response)
-
-                elif msg_type == "audio":
-                    # Process audio chunk
-                    audio_b64 = data.get("data", "")
-                    if audio_b64:
-                        audio_bytes = base64.b64decode(audio_b64)
-                        await handler.process_audio(audio_bytes)
-
-                elif msg_type == "text":
-                    # Process direct text input with validation
-                    content = data.get("content", "")
-                    if content:
-                        # Validate input length (max 10KB of text)
-                        if len(content) > 10000:
-                            await websocket.send_json({
-                                "type": "error",
-                                "message": "Text input too long (max 10,000 characters)",
-                            })
-                            continue
-                        await handler.process_text_input(content)
-
-                elif msg_type == "end_session":
-                    # End the session
-                    response = await handler.end_session()
-                    await websocket.send_json(response)
-                    break
-
-                elif msg_type == "get_document":
-                    # Get current document state
-                    if handler.document_manager:
-                        await websocket.send_json({
-                            "type": "document",
-                            "markdown": handler.document_manager.get_markdown(),
-                            "structure": handler.document_manager.get_structure(),
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+
+                # Binary frames are audio chunks; text frames are JSON control messages
+                audio_bytes = message.get("bytes")
+                if audio_bytes is not None:
+                    if len(audio_bytes) > MAX_AUDIO_FRAME_BYTES:
+                        await handler.send_message({
+                            "type": "error",
+                            "message": "Audio chunk too large",
                         })
+                    else:
+                        await handler.process_audio(audio_bytes)
+                    continue
+
+                try:
+                    data = orjson.loads(message["text"])
+                except orjson.JSONDecodeError:
+                    data = None
+                if not isinstance(data, dict):
+                    await handler.send_message({
+                        "type": "error",
+                        "message": "Invalid message: expected a JSON object",
+                    })
+                    continue
+                msg_type = data.get("type")
 
-                elif msg_type == "ping":
-                    # Keep-alive ping
-                    await websocket.send_json({"type": "pong"})
-
-                else:
-                    await websocket.send_json({
+                message_handler = MESSAGE_HANDLERS.get(msg_type)
+                if message_handler is None:
+                    await handler.send_message({
                         "type": "error",
                         "message": f"Unknown message type: {msg_type}",
                     })
+                elif await message_handler(handler, data):
+                    break
 
         except WebSocketDisconnect:
-            logger.info(f"WebSocket disconnected: {handler.session_id}")
-            # Clean up session
-            if handler.is_active:
-                await handler.end_session()
+            logger.info("WebSocket disconnected: %s", handler.session_id)
 
         except Exception as e:
-            logger.error(f"WebSocket error: {e}")
+            logger.error("WebSocket error: %s", e)
+            # Delivered if the connection is still open; the writer
+            # swallows send errors on a closed one
+            await handler.send_message({
+                "type": "error",
+                "message": "An unexpected error occurred",
+            })
+
+        finally:
             try:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "An unexpected error occurred",
-                })
-            except Exception:
-                # Connection likely already closed, nothing we can do
-                pass
+                # Clean up a session the client didn't end itself
+                if handler.is_active:
+                    await handler.end_session()
+            finally:
+                await handler.close_outbox()
 
 
 # ============================================================================
@@ -665,4 +1020,11 @@ if __name__ == "__main__":
         port=PORT,
         reload=True,
         log_level="info",
+        # C event loop and HTTP parser (both ship with uvicorn[standard])
+        loop="uvloop",
+        http="httptools",
+        # Browsers negotiate permessage-deflate, so full-document frames
+        # are compressed on the wire
+        ws="websockets",
+        ws_per_message_deflate=True,
     )
@@ -7,6 +7,8 @@ The AI serves dual purposes:
 2. Document: Organize thoughts into a structured markdown document
 """
 
+import hashlib
+
 THINKING_PARTNER_SYSTEM_PROMPT = """You are an expert thinking partner for busy professionals. Your role is to help people think through their ideas with SHORT, PUNCHY responses.
 
 ## RESPONSE STYLE - CRITICAL
@@ -55,77 +57,219 @@ IMPORTANT: Your response must be valid JSON in this exact format:
 
 Remember: SHORT responses. 1-3 sentences. ONE question. No fluff."""
 
+# Encoded once at import for hashing (e.g. the prompt-prefix fingerprint)
+SYSTEM_PROMPT_UTF8 = THINKING_PARTNER_SYSTEM_PROMPT.encode("utf-8")
+
+# Pinned digest of the system prompt. Any edit to the prompt invalidates the
+# prompt cache for every session, so changing it must also update this value.
+SYSTEM_PROMPT_SHA256 = "80c2bb6f2d901828b931e880e01be1aea75e6ecfd9a3e71b4ccc5d47f04c2f0e"
+if hashlib.sha256(SYSTEM_PROMPT_UTF8).hexdigest() != SYSTEM_PROMPT_SHA256:
+    raise RuntimeError(
+        "THINKING_PARTNER_SYSTEM_PROMPT changed - update SYSTEM_PROMPT_SHA256 "
+        "(this invalidates the prompt cache)"
+    )
+
+
+# Closing instruction for each kind of request. The system prompt and the
+# cached context blocks are shared, so only this uncached tail differs.
+RESPONSE_TASK_INSTRUCTIONS = {
+    "combined": (
+        '- Provide your response as JSON with "conversation" (your response/follow-up questions) '
+        'and "document_updates" (how to update the document).'
+    ),
+    "conversation": (
+        '- For this reply, ONLY write the conversational response. Return JSON with "conversation" '
+        'filled in and "document_updates" as an empty list - the document is handled separately.'
+    ),
+    "document_updates": (
+        '- For this reply, ONLY decide how to update the document. Return JSON with "conversation" '
+        'as an empty string and "document_updates" filled in - the reply is handled separately.'
+    ),
+}
+
+
+# Closing guidance after the new thought, prebuilt for each task
+_THOUGHT_FOOTERS = {
+    task: f"""
+
+IMPORTANT:
+- The user is speaking their thoughts out loud via voice transcription
+- Engage with the ACTUAL CONTENT of what they said - do NOT ask "what would you like to think through?" or similar
+- If they're discussing a topic (like organizing tasks, making decisions, etc.), engage with THAT topic
+{instructions}"""
+    for task, instructions in RESPONSE_TASK_INSTRUCTIONS.items()
+}
+
+
+# Fixed section text, kept out of the per-call formatting
+_PENDING_HEADER = "## Your Pending Questions (awaiting user response)\n"
+_ANSWERED_HEADER = "## Recently Answered Questions\n"
+_DOCUMENT_HEADER = "## Current Document Structure\n"
+_EMPTY_DOCUMENT_TEXT = _DOCUMENT_HEADER + "(Empty - this is a new session)\n"
+_CONVERSATION_HEADER = "## Recent Conversation\n"
+_EMPTY_CONVERSATION_TEXT = _CONVERSATION_HEADER + "(Starting fresh conversation)\n"
+
+
+# Number of recent conversation messages included in the prompt (3 exchanges)
+RECENT_MESSAGE_WINDOW = 6
+
+# Longest single message quoted in the conversation history; typed input
+# can be up to 10,000 characters and would otherwise dominate the prompt
+MESSAGE_MAX_CHARS = 2000
+
+# Budget for the whole conversation history (roughly 2,000 tokens). The
+# newest messages that fit are kept; earlier turns are still represented by
+# the transcript summary.
+CONVERSATION_MAX_CHARS = 8000
+
+# Most recent transcript text sent verbatim; anything older is only
+# represented by the rolling summary
+TRANSCRIPT_MAX_CHARS = 2000
+
+TRANSCRIPT_SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a spoken thinking session.
+
+Merge the new transcript text into the existing summary. Keep every topic, decision, \
+option, number, name and open question the user mentioned; drop filler and repetition. \
+Write plain prose or terse bullets, at most 250 words. Reply with the updated summary only."""
+
+
+def build_summary_prompt(summary: str, new_text: str) -> str:
+    """Build the user message asking to fold new transcript text into the summary."""
+    return (
+        f"## Current Summary\n{summary or '(none yet)'}\n\n"
+        f"## New Transcript Text\n{new_text}"
+    )
+
+
+def _clip_message(content: str) -> str:
+    """Keep the start and end of an overlong conversation message."""
+    if len(content) <= MESSAGE_MAX_CHARS:
+        return content
+    half = MESSAGE_MAX_CHARS // 2
+    return f"{content[:half]} [...] {content[-half:]}"
+
+
+def _conversation_window(messages: list[dict]) -> list[dict]:
+    """Return the newest messages (at most RECENT_MESSAGE_WINDOW) that fit CONVERSATION_MAX_CHARS."""
+    window = []
+    used = 0
+    for msg in reversed(messages[-RECENT_MESSAGE_WINDOW:]):
+        used += min(len(msg["content"]), MESSAGE_MAX_CHARS)
+        # Always keep the latest message, even if it alone is over budget
+        if window and used > CONVERSATION_MAX_CHARS:
+            break
+        window.append(msg)
+    window.reverse()
+    return window
+
 
 def build_thinking_prompt(
     current_document: str,
     recent_conversations: list[dict],
     new_thought: str,
     question_context: dict = None,
-    full_transcript: str = None
-) -> str:
+    full_transcript: str = None,
+    task: str = "combined",
+    transcript_summary: str = None
+) -> list[dict]:
     """
     Build the user message for Claude with context.
 
+    The message is split into content blocks in a fixed order, from most to
+    least stable, so the prefix can be served from Anthropic's prompt cache:
+
+    1. Summary of the earlier transcript (cached)
+    2. Document structure (cached, second breakpoint)
+    3. Recent conversation (uncached)
+    4. Question tracking, recent transcript and the new thought (uncached)
+
+    The summary goes first because it only changes when more transcript is
+    folded into it, while the document is updated on most turns.
+
+    Keep this order and formatting stable - any byte drift in the cached
+    blocks turns every turn into a cache miss.
+
     Args:
         current_document: The current markdown document content
         recent_conversations: List of recent conversation messages
         new_thought: The new transcript from the user
         question_context: Dict with pending and recently answered questions
-        full_transcript: The complete transcript of the session so far
+        full_transcript: Recent verbatim transcript (only the last
+            TRANSCRIPT_MAX_CHARS are used)
+        task: Which part of the response to ask for - "combined",
+            "conversation" or "document_updates"
+        transcript_summary: Rolling summary of transcript older than
+            full_transcript
 
     Returns:
-        Formatted prompt string
+        List of content blocks for the user message
     """
-    # Format recent conversation history
-    conversation_history = ""
-    if recent_conversations:
-        for msg in recent_conversations[-6:]:  # Last 6 messages (3 exchanges)
-            role = "User" if msg["role"] == "user" else "Assistant"
-            conversation_history += f"{role}: {msg['content']}\n\n"
+    # Format recent conversation history, newest messages within the budget
+    conversation_history = "".join(
+        f"{'User' if msg['role'] == 'user' else 'Assistant'}: {_clip_message(msg['content'])}\n\n"
+        for msg in _conversation_window(recent_conversations or [])
+    )
 
     # Format question tracking context
-    question_section = ""
+    question_parts = []
     if question_context:
         pending = question_context.get("pending", [])
         answered = question_context.get("recently_answered", [])
 
         if pending:
-            question_section += "## Your Pending Questions (awaiting user response)\n"
-            for i, q in enumerate(pending, 1):
-                question_section += f"{i}. {q}\n"
-            question_section += "\n"
+            question_parts.append(_PENDING_HEADER)
+            question_parts.extend(f"{i}. {q}\n" for i, q in enumerate(pending, 1))
+            question_parts.append("\n")
 
         if answered:
-            question_section += "## Recently Answered Questions\n"
-            for q in answered:
-                question_section += f"- {q} (answered)\n"
-            question_section += "\n"
+            question_parts.append(_ANSWERED_HEADER)
+            question_parts.extend(f"- {q} (answered)\n" for q in answered)
+            question_parts.append("\n")
+    question_section = "".join(question_parts)
 
-    # Include full transcript for context if available
-    transcript_section = ""
+    # Earlier transcript is carried by the summary, which is stable between
+    # summarization passes and so can be cached
+    background_section = ""
+    if transcript_summary and transcript_summary.strip():
+        background_section = f"## Session Background (summary of earlier transcript)\n{transcript_summary}\n\n"
+
+    # Recent transcript verbatim, truncated to the most recent text
+    recent_transcript_section = ""
     if full_transcript and full_transcript.strip():
-        # Truncate if too long, keeping most recent
-        if len(full_transcript) > 2000:
-            transcript_section = f"## Full Session Transcript (truncated)\n...{full_transcript[-2000:]}\n\n"
+        if len(full_transcript) > TRANSCRIPT_MAX_CHARS:
+            recent_transcript_section = f"## Recent Transcript (truncated)\n...{full_transcript[-TRANSCRIPT_MAX_CHARS:]}\n\n"
         else:
-            transcript_section = f"## Full Session Transcript\n{full_transcript}\n\n"
-
-    prompt = f"""## Current Document Structure
-{current_document if current_document else "(Empty - this is a new session)"}
+            recent_transcript_section = f"## Recent Transcript\n{full_transcript}\n\n"
 
-## Recent Conversation
-{conversation_history if conversation_history else "(Starting fresh conversation)"}
+    if current_document:
+        document_text = f"{_DOCUMENT_HEADER}{current_document}\n"
+    else:
+        document_text = _EMPTY_DOCUMENT_TEXT
 
-{transcript_section}{question_section}## New Thought from User
-{new_thought}
+    if conversation_history:
+        conversation_text = f"{_CONVERSATION_HEADER}{conversation_history}\n"
+    else:
+        conversation_text = _EMPTY_CONVERSATION_TEXT
 
-IMPORTANT:
-- The user is speaking their thoughts out loud via voice transcription
-- Engage with the ACTUAL CONTENT of what they said - do NOT ask "what would you like to think through?" or similar
-- If they're discussing a topic (like organizing tasks, making decisions, etc.), engage with THAT topic
-- Provide your response as JSON with "conversation" (your response/follow-up questions) and "document_updates" (how to update the document)."""
+    thought_text = "".join((
+        question_section,
+        recent_transcript_section,
+        "## New Thought from User\n",
+        new_thought,
+        _THOUGHT_FOOTERS[task],
+    ))
 
-    return prompt
+    blocks = []
+    if background_section:
+        blocks.append(
+            {"type": "text", "text": background_section, "cache_control": {"type": "ephemeral"}}
+        )
+    blocks.append(
+        {"type": "text", "text": document_text, "cache_control": {"type": "ephemeral"}}
+    )
+    blocks.append({"type": "text", "text": conversation_text})
+    blocks.append({"type": "text", "text": thought_text})
+    return blocks
 
 
 # Example initial document structure for reference
@@ -0,0 +1,208 @@
+import asyncio
+import json
+
+import anthropic
+import httpx
+import pytest
+
+from ai_processor import (
+    UNPROCESSED_THOUGHTS_SECTION,
+    AIProcessor,
+    ConversationStreamParser,
+    _find_json_span,
+)
+
+
+RESPONSE = (
+    '{"conversation": "Line one\\nShe said \\"go\\" \\u2014 caf\\u00e9 '
+    '\\ud83d\\ude00 {braces} \\\\ done", "document_updates": []}'
+)
+CONVERSATION = json.loads(RESPONSE)["conversation"]
+
+
+def _feed_all(parser, chunks):
+    return "".join(parser.feed(chunk) for chunk in chunks)
+
+
+def test_parser_whole_response():
+    parser = ConversationStreamParser()
+
+    assert parser.feed(RESPONSE) == CONVERSATION
+    assert parser.done
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7])
+def test_parser_split_at_every_position(size):
+    parser = ConversationStreamParser()
+    chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+
+    assert _feed_all(parser, chunks) == CONVERSATION
+    assert parser.done
+
+
+def test_parser_waits_for_the_key():
+    parser = ConversationStreamParser()
+
+    assert parser.feed('{"conver') == ""
+    assert parser.feed('sation": "hi') == "hi"
+    assert not parser.done
+
+
+def test_parser_holds_back_incomplete_escapes():
+    parser = ConversationStreamParser()
+
+    assert parser.feed('{"conversation": "a\\') == "a"
+    assert parser.feed('nb\\u00') == "\nb"
+    assert parser.feed('e9\\ud83d') == "é"
+    assert parser.feed('\\ude00"') == "\U0001F600"
+    assert parser.done
+
+
+@pytest.mark.parametrize("escape, text", [
+    ("\\uzz12", "\\uzz12"),
+    ("\\u12", "\\u12"),
+    ("\\ud83d\\u0041", "\ufffdA"),
+    ("\\ud83d!", "\ufffd!"),
+    ("\\ude00", "\ufffd"),
+])
+def test_parser_survives_malformed_unicode_escapes(escape, text):
+    parser = ConversationStreamParser()
+
+    assert parser.feed('{"conversation": "' + escape + '"') == text
+    assert parser.done
+
+
+def test_parser_waits_for_low_surrogate():
+    parser = ConversationStreamParser()
+
+    assert parser.feed('{"conversation": "\\ud83d\\') == ""
+    assert parser.feed('ude00"') == "\U0001F600"
+
+
+def test_parser_ignores_input_after_conversation():
+    parser = ConversationStreamParser()
+    parser.feed('{"conversation": "hi", ')
+
+    assert parser.feed('"document_updates": [{"content": "x"}]}') == ""
+
+
+def test_find_json_span_whole_response():
+    text = f"Here you go:\n{RESPONSE}\nThanks"
+
+    start, end = _find_json_span(text)
+
+    assert text[start:end] == RESPONSE
+
+
+def test_find_json_span_skips_objects_without_both_keys():
+    text = '{"conversation": "draft"} then ' + RESPONSE
+
+    start, end = _find_json_span(text)
+
+    assert text[start:end] == RESPONSE
+
+
+def test_find_json_span_from_start_offset():
+    text = '{"conversation": "a", "document_updates": []}\n```json\n' + RESPONSE
+
+    start, end = _find_json_span(text, text.index("```"))
+
+    assert text[start:end] == RESPONSE
+
+
+@pytest.mark.parametrize("cut", [1, 20, len(RESPONSE) // 2, len(RESPONSE) - 1])
+def test_find_json_span_truncated_response(cut):
+    assert _find_json_span(RESPONSE[:cut]) is None
+
+
+def test_find_json_span_truncated_inside_string_with_brace():
+    assert _find_json_span('{"conversation": "a } b", "document_updates": "}') is None
+
+
+def test_find_json_span_with_custom_keys():
+    text = 'Reply: {"conversation": "hi"}'
+
+    assert _find_json_span(text) is None
+    start, end = _find_json_span(text, keys=("conversation",))
+    assert text[start:end] == '{"conversation": "hi"}'
+
+
+def _processor():
+    # Skip __init__, which needs an API key; parsing uses no client state
+    return AIProcessor.__new__(AIProcessor)
+
+
+def test_parse_conversation_reply_without_document_updates():
+    text = 'Sure.\n```json\n{"conversation": "What matters most?"}\n```'
+
+    response = _processor()._parse_response_sync(text, keys=("conversation",))
+
+    assert response.conversation == "What matters most?"
+    assert response.document_updates == []
+
+
+def test_parse_updates_reply_without_conversation():
+    text = '{"document_updates": [{"action": "add_section", "path": "Ideas", "content": "- x"}]}'
+
+    response = _processor()._parse_response_sync(text, keys=("document_updates",))
+
+    assert response.conversation == ""
+    assert [u.path for u in response.document_updates] == ["Ideas"]
+
+
+def test_parse_non_object_json_as_text():
+    response = _processor()._parse_response_sync('"just a string"')
+
+    assert response.conversation == '"just a string"'
+
+
+def test_failed_call_cancels_the_other():
+    processor = _processor()
+    processor.max_tokens = 2048
+    processor.conversation_max_tokens = 512
+    processor.updates_max_tokens = 1024
+    deltas = []
+    cancelled = asyncio.Event()
+
+    async def complete(user_content, on_conversation_delta=None, max_tokens=None):
+        if on_conversation_delta is None:
+            await asyncio.sleep(0)
+            raise anthropic.APIConnectionError(request=httpx.Request("POST", "https://api"))
+        try:
+            while True:
+                await on_conversation_delta("x")
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def on_delta(text):
+        deltas.append(text)
+
+    async def run():
+        processor._complete = complete
+        response = await processor.process_thought("thought", "", [], on_conversation_delta=on_delta)
+        seen = len(deltas)
+        await asyncio.sleep(0.05)
+        return response, seen
+
+    response, seen = asyncio.run(run())
+
+    assert response.document_updates[0].path == UNPROCESSED_THOUGHTS_SECTION
+    assert cancelled.is_set()
+    assert len(deltas) == seen
+
+
+def test_stream_read_error_falls_back():
+    processor = _processor()
+    processor.max_tokens = 2048
+    processor.conversation_max_tokens = 512
+    processor.updates_max_tokens = 1024
+
+    async def complete(user_content, on_conversation_delta=None, max_tokens=None):
+        raise httpx.ReadError("connection reset mid-stream")
+
+    processor._complete = complete
+    response = asyncio.run(processor.process_thought("thought", "", []))
+
+    assert response.document_updates[0].content == "- thought"
@@ -0,0 +1,100 @@
+import prompts
+from prompts import (
+    CONVERSATION_MAX_CHARS,
+    MESSAGE_MAX_CHARS,
+    RECENT_MESSAGE_WINDOW,
+    _EMPTY_CONVERSATION_TEXT,
+    _clip_message,
+    _conversation_window,
+    build_thinking_prompt,
+)
+
+
+def _messages(*lengths):
+    """One message per length, alternating roles, each filled with its index."""
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": str(i % 10) * length}
+        for i, length in enumerate(lengths)
+    ]
+
+
+def _conversation_block(messages):
+    blocks = build_thinking_prompt("", messages, "new thought")
+    return blocks[-2]["text"]
+
+
+def test_clip_message_keeps_short_messages():
+    content = "x" * MESSAGE_MAX_CHARS
+    assert _clip_message(content) is content
+
+
+def test_clip_message_keeps_start_and_end():
+    half = MESSAGE_MAX_CHARS // 2
+    content = "a" * half + "b" * 500 + "c" * half
+
+    clipped = _clip_message(content)
+
+    assert clipped == "a" * half + " [...] " + "c" * half
+
+
+def test_window_keeps_most_recent_messages():
+    messages = _messages(*[10] * (RECENT_MESSAGE_WINDOW + 3))
+
+    assert _conversation_window(messages) == messages[-RECENT_MESSAGE_WINDOW:]
+
+
+def test_window_keeps_messages_exactly_at_budget():
+    count = CONVERSATION_MAX_CHARS // MESSAGE_MAX_CHARS
+    messages = _messages(*[MESSAGE_MAX_CHARS] * count)
+
+    assert _conversation_window(messages) == messages
+
+
+def test_window_drops_oldest_message_one_char_over_budget():
+    count = CONVERSATION_MAX_CHARS // MESSAGE_MAX_CHARS
+    messages = _messages(1, *[MESSAGE_MAX_CHARS] * count)
+
+    assert _conversation_window(messages) == messages[1:]
+
+
+def test_window_stops_at_first_message_that_does_not_fit():
+    # The small oldest message would fit, but the window stays contiguous
+    messages = _messages(1, MESSAGE_MAX_CHARS, 1, *[MESSAGE_MAX_CHARS] * 3)
+
+    assert _conversation_window(messages) == messages[2:]
+
+
+def test_window_counts_overlong_messages_at_clipped_length():
+    count = CONVERSATION_MAX_CHARS // MESSAGE_MAX_CHARS
+    messages = _messages(*[MESSAGE_MAX_CHARS * 3] * count)
+
+    assert _conversation_window(messages) == messages
+
+
+def test_window_always_keeps_latest_message(monkeypatch):
+    monkeypatch.setattr(prompts, "CONVERSATION_MAX_CHARS", 100)
+    messages = _messages(10, 500)
+
+    assert _conversation_window(messages) == messages[-1:]
+
+
+def test_prompt_quotes_only_windowed_messages():
+    messages = _messages(1, *[MESSAGE_MAX_CHARS] * 4)
+
+    text = _conversation_block(messages)
+
+    assert "User: 0\n" not in text
+    assert text.count("User: ") + text.count("Assistant: ") == 4
+
+
+def test_prompt_clips_overlong_latest_message():
+    messages = _messages(MESSAGE_MAX_CHARS * 5)
+
+    text = _conversation_block(messages)
+
+    assert " [...] " in text
+    assert len(text) < MESSAGE_MAX_CHARS + 100
+
+
+def test_prompt_without_conversation():
+    assert _conversation_block([]) == _EMPTY_CONVERSATION_TEXT
@@ -9,24 +9,144 @@ The module handles audio streaming, transcription, and pause detection.
 """
 
 import os
+import re
+import time
+import struct
 import asyncio
-import json
-import base64
 import logging
+import functools
 from abc import ABC, abstractmethod
 from typing import AsyncGenerator, Callable, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
+import httpx
+import orjson
+import websockets
 from dotenv import load_dotenv
+from openai import AsyncOpenAI
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Queued after the last result so receive_transcripts can block on the queue
+# instead of polling it
+_SHUTDOWN = object()
+
+# Results waiting for the session to read them. Finals wait for room;
+# interim results are dropped when full, the next one supersedes them.
+TRANSCRIPT_QUEUE_SIZE = 256
+
+
+def _signal_shutdown(queue: asyncio.Queue) -> None:
+    """Queue _SHUTDOWN without blocking, evicting the oldest result if full."""
+    if queue.full():
+        # Only reached once the reader has stopped keeping up
+        queue.get_nowait()
+    queue.put_nowait(_SHUTDOWN)
+
+
+async def _drain_transcripts(queue: asyncio.Queue) -> AsyncGenerator["TranscriptionResult", None]:
+    """Yield results from a provider's queue until _SHUTDOWN is reached."""
+    while True:
+        result = await queue.get()
+        if result is _SHUTDOWN:
+            return
+        yield result
+
+# Every webm stream starts with the EBML magic number; media data follows
+# in Cluster elements, everything before the first one is the header
+_EBML_MAGIC = b"\x1aE\xdf\xa3"
+_CLUSTER_ID = b"\x1fC\xb6u"
+
+
+def _normalize_word(word: str) -> str:
+    """Normalize a word for comparison (lowercase, strip edge punctuation)."""
+    return word.lower().strip('.,!?;:\'"()[]{}')
+
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+# A word repeated 3+ times in a row (e.g., "Bye! Bye! Bye! Bye!")
+_REPEATED_WORD_RE = re.compile(r'\b(\w+)(?:\s+\1){2,}\b', re.IGNORECASE)
+# Common Whisper hallucination phrases
+_HALLUCINATION_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\bbye\b.*\bbye\b.*\bbye\b',  # Multiple byes
+        r'\bthank you for watching\b',
+        r'\bsubscribe\b.*\blike\b',
+        r'\bplease subscribe\b',
+        r'\bsee you (next time|tomorrow|then)\b.*\bbye\b',
+        r'\bthanks for listening\b',
+    )
+)
+
+
+def _normalize_phrase(text: str) -> str:
+    """Normalize text for comparison - lowercase, remove punctuation."""
+    return _PUNCTUATION_RE.sub('', text.lower()).strip()
+
+
+def _filter_hallucinations(text: str) -> str:
+    """Filter out common Whisper hallucinations."""
+    # Remove repeated words (e.g., "Bye! Bye! Bye! Bye!" -> "Bye!")
+    text = _REPEATED_WORD_RE.sub(r'\1', text)
+
+    for pattern in _HALLUCINATION_RES:
+        text = pattern.sub('', text)
+
+    # Clean up extra whitespace
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def _wav_header(data_size: int, sample_rate: int = 16000) -> bytes:
+    """RIFF/WAVE header for data_size bytes of 16-bit mono PCM."""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_size,
+    )
+
+
+# Shared OpenAI client so every Whisper stream reuses pooled connections
+_openai_http_client = None
+_openai_client = None
+
+
+def get_openai_client(api_key: str):
+    """Get the process-wide OpenAI client, creating it on first use."""
+    global _openai_http_client, _openai_client
+
+    if _openai_client is None:
+        # HTTP/2 multiplexes overlapping Whisper calls over one connection;
+        # idle connections outlive the gaps between snapshots
+        _openai_http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=120.0),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+        _openai_client = AsyncOpenAI(api_key=api_key, http_client=_openai_http_client)
+    return _openai_client
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client and its connection pool."""
+    global _openai_http_client, _openai_client
+
+    if _openai_http_client is not None:
+        await _openai_http_client.aclose()
+    _openai_http_client = None
+    _openai_client = None
+
 
 class TranscriptionResult:
     """Represents a transcription result from the provider."""
 
+    # Created for every interim result, so keep instances small
+    __slots__ = ("text", "is_final", "confidence", "_timestamp", "_created")
+
     def __init__(
         self,
         text: str,
@@ -37,7 +157,15 @@ class TranscriptionResult:
         self.text = text
         self.is_final = is_final
         self.confidence = confidence
-        self.timestamp = timestamp or datetime.utcnow()
+        self._timestamp = timestamp
+        # Arrival time as a float; the datetime is only built if asked for
+        self._created = time.time()
+
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created, timezone.utc)
+        return self._timestamp
 
     def to_dict(self) -> dict:
         return {
@@ -71,6 +199,13 @@ class TranscriptionProvider(ABC):
         """Close the connection."""
         pass
 
+    def flush(self) -> None:
+        """
+        Hint that the speaker just paused, a natural point to transcribe.
+
+        Streaming providers find their own boundaries and ignore it.
+        """
+
 
 class DeepgramProvider(TranscriptionProvider):
     """
@@ -80,6 +215,15 @@ class DeepgramProvider(TranscriptionProvider):
     Supports interim results for low-latency display.
     """
 
+    # Audio received within this window goes out as one WebSocket frame
+    SEND_INTERVAL = 0.02
+    # Largest frame sent: 500ms of 16-bit 16kHz mono audio
+    MAX_SEND_BYTES = 16000
+    # Interim results are passed on at most this often, newest first
+    INTERIM_INTERVAL = 0.05
+    # How long close() waits for the finals of the last audio
+    CLOSE_TIMEOUT = 2.0
+
     def __init__(self):
         self.api_key = os.getenv("DEEPGRAM_API_KEY")
         if not self.api_key:
@@ -87,8 +231,17 @@ class DeepgramProvider(TranscriptionProvider):
 
         self._websocket = None
         self._receive_task = None
-        self._transcript_queue: asyncio.Queue[TranscriptionResult] = asyncio.Queue()
+        self._transcript_queue: asyncio.Queue[TranscriptionResult] = asyncio.Queue(
+            maxsize=TRANSCRIPT_QUEUE_SIZE
+        )
         self._is_connected = False
+        # Audio waiting to be sent, and the task that sends it
+        self._send_buffer = bytearray()
+        self._send_ready = asyncio.Event()
+        self._send_task = None
+        # Newest interim not yet queued, and the timer that queues it
+        self._latest_interim: Optional[TranscriptionResult] = None
+        self._interim_handle: Optional[asyncio.TimerHandle] = None
 
     async def start_stream(self) -> None:
         """
@@ -102,8 +255,6 @@ class DeepgramProvider(TranscriptionProvider):
         - endpointing: 300ms (detect end of speech)
         - vad_events: true (voice activity detection)
         """
-        import websockets
-
         url = (
             "wss://api.deepgram.com/v1/listen?"
             "model=nova-2&"
@@ -121,31 +272,37 @@ class DeepgramProvider(TranscriptionProvider):
             "Authorization": f"Token {self.api_key}"
         }
 
+        # No permessage-deflate: PCM barely compresses, and deflating every
+        # frame would run on the event loop
         self._websocket = await websockets.connect(
             url,
             extra_headers=headers,
+            compression=None,
             ping_interval=20,
             ping_timeout=10
         )
         self._is_connected = True
 
-        # Start receiving messages in background
+        # Start receiving messages and sending audio in background
         self._receive_task = asyncio.create_task(self._receive_loop())
+        self._send_task = asyncio.create_task(self._send_loop())
 
     async def _receive_loop(self) -> None:
         """Background task to receive and parse Deepgram messages."""
         try:
             async for message in self._websocket:
-                data = json.loads(message)
+                # orjson parses str or bytes frames without a decode step
+                data = orjson.loads(message)
+                msg_type = data.get("type")
 
                 # Handle transcription results
-                if data.get("type") == "Results":
-                    channel = data.get("channel", {})
-                    alternatives = channel.get("alternatives", [])
+                if msg_type == "Results":
+                    alternatives = data.get("channel", {}).get("alternatives")
 
                     if alternatives:
-                        transcript = alternatives[0].get("transcript", "")
-                        confidence = alternatives[0].get("confidence", 1.0)
+                        best = alternatives[0]
+                        transcript = best.get("transcript", "")
+                        confidence = best.get("confidence", 1.0)
                         is_final = data.get("is_final", False)
 
                         if transcript:  # Only queue non-empty transcripts
@@ -154,65 +311,126 @@ class DeepgramProvider(TranscriptionProvider):
                                 is_final=is_final,
                                 confidence=confidence
                             )
-                            await self._transcript_queue.put(result)
+                            if is_final:
+                                # The final supersedes any interim still waiting
+                                self._latest_interim = None
+                                await self._transcript_queue.put(result)
+                            else:
+                                self._latest_interim = result
+                                if self._interim_handle is None:
+                                    self._interim_handle = asyncio.get_running_loop().call_later(
+                                        self.INTERIM_INTERVAL, self._queue_latest_interim
+                                    )
 
                 # Handle speech detection events
-                elif data.get("type") == "SpeechStarted":
+                elif msg_type == "SpeechStarted":
                     # Could emit an event here if needed
                     pass
 
                 # Handle metadata
-                elif data.get("type") == "Metadata":
+                elif msg_type == "Metadata":
                     # Connection metadata, can be logged
                     pass
 
         except Exception as e:
-            # Log error and put sentinel to signal closure
-            logger.error(f"Deepgram receive error: {e}")
+            logger.error("Deepgram receive error: %s", e)
+        finally:
+            # The server closed the stream, it failed, or close() gave up
+            # waiting - either way no more results will come
             self._is_connected = False
+            _signal_shutdown(self._transcript_queue)
+
+    def _queue_latest_interim(self) -> None:
+        """Queue the newest interim result; older ones it replaced are dropped."""
+        self._interim_handle = None
+        if self._latest_interim is not None:
+            try:
+                self._transcript_queue.put_nowait(self._latest_interim)
+            except asyncio.QueueFull:
+                pass
+            self._latest_interim = None
 
     async def send_audio(self, audio_data: bytes) -> None:
         """
-        Send raw audio data to Deepgram.
+        Queue raw audio data for Deepgram.
+
+        Frames arriving close together are coalesced by _send_loop into
+        fewer, larger WebSocket messages.
 
         Args:
             audio_data: Raw PCM audio bytes (16-bit, 16kHz, mono)
         """
         if self._websocket and self._is_connected:
+            self._send_buffer.extend(audio_data)
+            self._send_ready.set()
+
+    async def _send_loop(self) -> None:
+        """Background task sending buffered audio every SEND_INTERVAL."""
+        while self._is_connected:
+            await self._send_ready.wait()
+            # Give the frames right behind this one a moment to arrive
+            await asyncio.sleep(self.SEND_INTERVAL)
+            self._send_ready.clear()
+            await self._flush_send_buffer()
+
+    async def _flush_send_buffer(self) -> None:
+        """Send buffered audio in whole 16-bit samples, at most MAX_SEND_BYTES per frame."""
+        while len(self._send_buffer) >= 2:
+            size = min(len(self._send_buffer), self.MAX_SEND_BYTES) & ~1
+            frame = bytes(self._send_buffer[:size])
+            del self._send_buffer[:size]
             try:
-                await self._websocket.send(audio_data)
+                await self._websocket.send(frame)
             except Exception as e:
-                logger.error(f"Error sending audio to Deepgram: {e}")
+                logger.error("Error sending audio to Deepgram: %s", e)
                 self._is_connected = False
+                return
 
     async def receive_transcripts(self) -> AsyncGenerator[TranscriptionResult, None]:
-        """Yield transcription results as they arrive."""
-        while self._is_connected or not self._transcript_queue.empty():
-            try:
-                result = await asyncio.wait_for(
-                    self._transcript_queue.get(),
-                    timeout=0.1
-                )
-                yield result
-            except asyncio.TimeoutError:
-                continue
-            except Exception:
-                break
+        """Yield transcription results as they arrive, until closed."""
+        async for result in _drain_transcripts(self._transcript_queue):
+            yield result
 
     async def close(self) -> None:
-        """Close the Deepgram WebSocket connection."""
+        """
+        Close the Deepgram WebSocket connection.
+
+        Sends the remaining audio and CloseStream, then waits up to
+        CLOSE_TIMEOUT for the finals Deepgram returns before it closes the
+        stream, so the end of the last utterance isn't lost.
+        """
         self._is_connected = False
 
-        if self._receive_task:
-            self._receive_task.cancel()
+        if self._send_task:
+            self._send_task.cancel()
             try:
-                await self._receive_task
+                await self._send_task
             except asyncio.CancelledError:
                 pass
+        if self._websocket:
+            # Don't drop the last few milliseconds of audio
+            await self._flush_send_buffer()
+            try:
+                await self._websocket.send(orjson.dumps({"type": "CloseStream"}).decode())
+            except Exception as e:
+                logger.warning("Error sending CloseStream to Deepgram: %s", e)
+
+        if self._receive_task:
+            try:
+                # Cancels the receive loop if it runs past the timeout
+                await asyncio.wait_for(self._receive_task, timeout=self.CLOSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Deepgram didn't close the stream within %.1fs", self.CLOSE_TIMEOUT)
+
+        if self._interim_handle:
+            self._interim_handle.cancel()
+            self._interim_handle = None
 
         if self._websocket:
             await self._websocket.close()
 
+        _signal_shutdown(self._transcript_queue)
+
 
 class WhisperProvider(TranscriptionProvider):
     """
@@ -223,19 +441,42 @@ class WhisperProvider(TranscriptionProvider):
 
     Configuration:
     - Transcribes every 2 seconds for responsive feedback
-    - Keeps full audio buffer (webm requires header from first chunk)
+    - Sends only the last window_seconds of audio, behind the webm header
+      kept from the first chunk, so each call costs the same however long
+      the session runs
     - Tracks previous transcription to only emit new content
-    - Handles webm/opus audio format from browser MediaRecorder
+    - Handles raw 16-bit 16kHz PCM from the browser (uploaded as WAV), and
+      webm/opus from clients still using MediaRecorder
     """
 
-    def __init__(self, transcribe_interval: float = 2.0):
+    def __init__(
+        self,
+        transcribe_interval: float = 2.0,
+        max_concurrent_transcriptions: int = 4,
+        window_seconds: float = 30.0
+    ):
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY environment variable is required")
 
         self.transcribe_interval = transcribe_interval
-        self._audio_buffer = bytearray()
-        self._transcript_queue: asyncio.Queue[TranscriptionResult] = asyncio.Queue()
+        self.window_seconds = window_seconds
+        # Received audio frames, kept as the immutable bytes objects they
+        # arrived as and joined once per transcription
+        self._audio_chunks: list[bytes] = []
+        self._audio_size = 0
+        # Whether the stream is raw 16-bit 16kHz PCM rather than webm,
+        # decided from the first chunk
+        self._is_pcm: Optional[bool] = None
+        # webm header (everything before the first Cluster), prepended to
+        # each windowed snapshot
+        self._header: Optional[bytes] = None
+        # Total audio received and when it started, to size the window
+        self._received_bytes = 0
+        self._first_audio_at: Optional[float] = None
+        self._transcript_queue: asyncio.Queue[TranscriptionResult] = asyncio.Queue(
+            maxsize=TRANSCRIPT_QUEUE_SIZE
+        )
         self._is_active = False
         self._transcribe_task = None
         self._client = None
@@ -245,23 +486,47 @@ class WhisperProvider(TranscriptionProvider):
         self._max_audio_bytes = 25 * 1024 * 1024
         # Track previous transcription to detect new content
         self._last_transcript = ""
+        # _last_transcript's words, normalized once for the next comparison
+        self._last_words_normalized: list[str] = []
         self._full_session_transcript = ""  # Complete transcript for the session
         self._emitted_phrases: set[str] = set()  # Track emitted phrases to prevent duplicates
-        self._last_audio_size = 0
+        self._last_received = 0  # _received_bytes at the last snapshot
         self._transcribe_count = 0
+        # Snapshots being transcribed by sequence number, at most
+        # max_concurrent_transcriptions at a time, and the newest one whose
+        # result has been applied
+        self._transcribe_slots = asyncio.Semaphore(max_concurrent_transcriptions)
+        self._inflight: dict[int, asyncio.Task] = {}
+        self._last_applied_seq = 0
+        # Set on a speech pause to transcribe before the interval elapses
+        self._flush_event = asyncio.Event()
+        # Set while there is audio no snapshot has covered yet
+        self._new_audio = asyncio.Event()
+        # Consecutive failed calls, and the monotonic time before which no
+        # new snapshot is sent. Every retry resends the whole (growing)
+        # buffer, so an outage shouldn't be met with a call per interval.
+        self._failures = 0
+        self._retry_at = 0.0
+        self._max_retry_delay = 30.0
 
     async def start_stream(self) -> None:
         """Initialize the Whisper provider."""
-        from openai import AsyncOpenAI
-
-        self._client = AsyncOpenAI(api_key=self.api_key)
+        self._client = get_openai_client(self.api_key)
         self._is_active = True
-        self._audio_buffer = bytearray()
+        self._audio_chunks = []
+        self._audio_size = 0
+        self._is_pcm = None
+        self._header = None
+        self._received_bytes = 0
+        self._first_audio_at = None
         self._last_transcript = ""
+        self._last_words_normalized = []
         self._full_session_transcript = ""
         self._emitted_phrases = set()
-        self._last_audio_size = 0
+        self._last_received = 0
+        self._new_audio.clear()
         self._transcribe_count = 0
+        self._last_applied_seq = 0
 
         # Start periodic transcription task
         self._transcribe_task = asyncio.create_task(self._periodic_transcribe())
@@ -271,68 +536,195 @@ class WhisperProvider(TranscriptionProvider):
         """
         Periodically transcribe accumulated audio.
 
-        Sends the FULL audio buffer each time (webm needs header from start).
-        Compares with previous transcription to only emit new content.
+        Sends the recent audio window each time (see _trim_to_window).
+        Transcribes as soon as the client reports a pause in speech, or after
+        transcribe_interval at the latest, and sleeps while no new audio
+        arrives. Each snapshot is transcribed in its own task, so a slow
+        Whisper call doesn't hold back the next one; see _transcribe_snapshot
+        for how overlapping results are ordered.
         """
-        import io
-
         while self._is_active:
-            await asyncio.sleep(self.transcribe_interval)
+            await self._new_audio.wait()
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.transcribe_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
 
-            current_size = len(self._audio_buffer)
+            current_size = self._audio_size
 
-            # Check if buffer is too large - if so, we need to reset
+            # Check if buffer is too large - if so, we need to reset (only
+            # reachable when the stream has no cluster boundaries to trim at)
             if current_size > self._max_audio_bytes:
-                logger.warning(f"Audio buffer exceeded max size ({current_size} bytes), resetting...")
+                logger.warning("Audio buffer exceeded max size (%d bytes), resetting...", current_size)
                 # Save the current full transcript before resetting
                 if self._last_transcript:
                     self._full_session_transcript += " " + self._last_transcript
-                self._audio_buffer = bytearray()
+                self._audio_chunks = [self._header] if self._header else []
+                self._audio_size = len(self._header or b"")
                 self._last_transcript = ""
-                self._last_audio_size = 0
+                self._last_words_normalized = []
+                # Results still in flight describe the old buffer
+                self._last_applied_seq = self._transcribe_count
+                self._cancel_superseded(self._transcribe_count + 1)
                 continue
 
-            # Only transcribe if we have new audio data above threshold
-            if current_size > self._min_audio_bytes and current_size > self._last_audio_size:
-                # Copy the full buffer (don't clear - webm needs the header)
-                audio_data = bytes(self._audio_buffer)
-                self._last_audio_size = current_size
+            # Only transcribe if we have new audio data above threshold;
+            # with every slot busy, wait - the next snapshot covers this audio
+            if (
+                current_size > self._min_audio_bytes
+                and self._received_bytes > self._last_received
+                and not self._transcribe_slots.locked()
+                and time.monotonic() >= self._retry_at
+            ):
+                # Snapshot the recent window. The snapshot replaces the
+                # chunks, so older audio is released and the next join
+                # starts from one piece. The upload is built with a single
+                # copy of the window, or none for webm that needs no trim.
+                audio_data = self._trim_to_window(b"".join(self._audio_chunks))
+                self._audio_chunks = [audio_data]
+                self._audio_size = len(audio_data)
+                self._last_received = self._received_bytes
+                self._new_audio.clear()
                 self._transcribe_count += 1
 
-                # Create audio file in memory
-                audio_file = io.BytesIO(audio_data)
-                audio_file.name = "audio.webm"
-
-                try:
-                    # Call Whisper API with full audio
-                    response = await self._client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file,
-                        language="en"
+                if self._is_pcm:
+                    # Whisper needs a container; a WAV header is 44 bytes
+                    size = len(audio_data) & ~1
+                    upload = (
+                        "audio.wav",
+                        b"".join((_wav_header(size), memoryview(audio_data)[:size])),
+                        "audio/wav",
                     )
+                else:
+                    upload = ("audio.webm", audio_data, "audio/webm")
+
+                task = asyncio.create_task(
+                    self._transcribe_snapshot(upload, self._transcribe_count)
+                )
+                self._inflight[self._transcribe_count] = task
+                task.add_done_callback(
+                    lambda _, seq=self._transcribe_count: self._inflight.pop(seq, None)
+                )
 
-                    full_text = response.text.strip() if response.text else ""
-                    logger.debug(f"Whisper #{self._transcribe_count}: '{full_text[:80]}...' ({len(full_text)} chars)")
+    def _trim_to_window(self, data: bytes) -> bytes:
+        """
+        Cut buffered audio down to roughly the last window_seconds.
 
-                    if full_text:
-                        # Find new content by comparing with previous transcript
-                        new_text = self._extract_new_content(full_text)
+        The window is sized from the stream's own byte rate. PCM is cut at
+        any sample; webm only at a Cluster boundary, with the header put
+        back in front. Without a boundary old enough, the data is returned
+        as is and the next cycle tries again.
+        """
+        if not self._is_pcm and self._header is None:
+            first_cluster = data.find(_CLUSTER_ID)
+            if first_cluster > 0:
+                self._header = data[:first_cluster]
+
+        if self._first_audio_at is None:
+            return data
+        elapsed = time.monotonic() - self._first_audio_at
+        if elapsed <= self.window_seconds:
+            return data
+        window = int(self._received_bytes / elapsed * self.window_seconds)
+        if len(data) <= window:
+            return data
+
+        if self._is_pcm:
+            return data[(len(data) - window) & ~1:]
+
+        if self._header is None:
+            return data
+        # Latest cluster starting at least `window` bytes before the end
+        start = data.rfind(_CLUSTER_ID, len(self._header) + 1, len(data) - window + len(_CLUSTER_ID))
+        if start == -1:
+            return data
+        return b"".join((self._header, memoryview(data)[start:]))
+
+    async def _transcribe_snapshot(self, upload: tuple[str, bytes, str], seq: int) -> None:
+        """
+        Transcribe one buffer snapshot and emit its new content.
 
-                        if new_text:
-                            result = TranscriptionResult(
-                                text=new_text,
-                                is_final=True,
-                                confidence=1.0
-                            )
-                            await self._transcript_queue.put(result)
-                            logger.debug(f"Whisper emitting new: '{new_text[:50]}...'")
-                        else:
-                            logger.debug("Whisper: no new content detected")
+        upload is a (filename, data, content type) file tuple, which the
+        SDK sends as is. Snapshots overlap and a later one always reaches
+        further into the audio than an earlier one. A result that finishes
+        after a newer one was applied is dropped instead of being reordered,
+        and applying a result cancels the older snapshots still in flight.
+        """
+        try:
+            async with self._transcribe_slots:
+                # Call Whisper API with the windowed audio
+                response = await self._client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=upload,
+                    language="en"
+                )
+        except Exception as e:
+            self._failures += 1
+            delay = min(self.transcribe_interval * 2 ** self._failures, self._max_retry_delay)
+            self._retry_at = time.monotonic() + delay
+            logger.error(
+                "Whisper transcription error (%d in a row, retrying in %.0fs): %s",
+                self._failures, delay, e
+            )
+            return
+
+        self._failures = 0
+
+        if seq <= self._last_applied_seq:
+            logger.debug("Whisper #%d: superseded by #%d, dropped", seq, self._last_applied_seq)
+            return
+        self._last_applied_seq = seq
+        self._cancel_superseded(seq)
+
+        full_text = response.text.strip() if response.text else ""
+        logger.debug("Whisper #%d: '%.80s...' (%d chars)", seq, full_text, len(full_text))
+
+        if full_text:
+            # Find new content by comparing with previous transcript
+            new_text = self._extract_new_content(full_text)
 
-                        self._last_transcript = full_text
+            if new_text:
+                result = TranscriptionResult(
+                    text=new_text,
+                    is_final=True,
+                    confidence=1.0
+                )
+                await self._transcript_queue.put(result)
+                logger.debug("Whisper emitting new: '%.50s...'", new_text)
+            else:
+                logger.debug("Whisper: no new content detected")
+
+            self._last_transcript = full_text
+            self._last_words_normalized = [_normalize_word(w) for w in full_text.split()]
+
+    def _cancel_superseded(self, seq: int) -> None:
+        """Cancel in-flight snapshots older than seq; their results would be dropped."""
+        for older, task in list(self._inflight.items()):
+            if older < seq:
+                task.cancel()
 
-                except Exception as e:
-                    logger.error(f"Whisper transcription error: {e}")
+    @staticmethod
+    def _words_after_anchor(last_norm: list[str], full_norm: list[str]) -> Optional[int]:
+        """
+        Return the index in full_norm just past the end of last_norm.
+
+        Both are normalized word lists. The tail of the previous transcript
+        is looked up in the new one, trying shorter tails if Whisper worded
+        the longer ones differently. Returns None if no tail is found.
+        """
+        # Space-delimited on both sides so matches fall on word boundaries
+        haystack = " " + " ".join(full_norm) + " "
+        for size in (10, 5, 3):
+            if len(last_norm) < size:
+                continue
+            needle = " " + " ".join(last_norm[-size:]) + " "
+            # Rightmost match, so a phrase the user repeats doesn't re-emit
+            pos = haystack.rfind(needle)
+            if pos != -1:
+                # Separators up to the match end, less the leading one
+                return haystack.count(" ", 0, pos + len(needle)) - 1
+        return None
 
     def _extract_new_content(self, full_text: str) -> str:
         """
@@ -340,39 +732,13 @@ class WhisperProvider(TranscriptionProvider):
 
         Three-step approach:
         1. Filter out Whisper hallucinations (repeated words, common false positives)
-        2. Use prefix matching to find candidate new content
+        2. Find candidate new content after the end of the previous transcript
+           (the audio window slides, so the start of the two can differ),
+           falling back to prefix matching
         3. Filter out any phrases that have already been emitted (duplicate detection)
         """
-        import re
-
-        def normalize_phrase(text: str) -> str:
-            """Normalize text for comparison - lowercase, remove punctuation."""
-            return re.sub(r'[^\w\s]', '', text.lower()).strip()
-
-        def filter_hallucinations(text: str) -> str:
-            """Filter out common Whisper hallucinations."""
-            # Remove repeated words (e.g., "Bye! Bye! Bye! Bye!" -> "Bye!")
-            # Pattern: word repeated 3+ times in a row
-            text = re.sub(r'\b(\w+)(?:\s+\1){2,}\b', r'\1', text, flags=re.IGNORECASE)
-
-            # Remove common Whisper hallucination phrases
-            hallucination_patterns = [
-                r'\bbye\b.*\bbye\b.*\bbye\b',  # Multiple byes
-                r'\bthank you for watching\b',
-                r'\bsubscribe\b.*\blike\b',
-                r'\bplease subscribe\b',
-                r'\bsee you (next time|tomorrow|then)\b.*\bbye\b',
-                r'\bthanks for listening\b',
-            ]
-            for pattern in hallucination_patterns:
-                text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-
-            # Clean up extra whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-            return text
-
         # First, filter hallucinations from the full text
-        full_text = filter_hallucinations(full_text)
+        full_text = _filter_hallucinations(full_text)
 
         if not full_text:
             return ""
@@ -383,44 +749,43 @@ class WhisperProvider(TranscriptionProvider):
             return full_text
 
         # Use split() consistently for comparison and extraction
-        last_words = self._last_transcript.split()
+        last_norm = self._last_words_normalized
         full_words = full_text.split()
+        full_norm = [_normalize_word(w) for w in full_words]
 
-        # If new transcription is shorter or same, nothing new
-        if len(full_words) <= len(last_words):
-            return ""
-
-        # Normalize for comparison only (lowercase, strip edge punctuation)
-        def normalize_word(w: str) -> str:
-            return w.lower().strip('.,!?;:\'"()[]{}')
-
-        # Find longest common prefix (allowing for small variations)
-        common_prefix_len = 0
-        mismatches = 0
-        max_mismatches = 2
+        anchor_end = self._words_after_anchor(last_norm, full_norm)
+        if anchor_end is not None:
+            candidate_words = full_words[anchor_end:]
+        else:
+            # If new transcription is shorter or same, nothing new
+            if len(full_words) <= len(last_norm):
+                return ""
+
+            # Find longest common prefix (allowing for small variations)
+            common_prefix_len = 0
+            mismatches = 0
+            max_mismatches = 2
+
+            for i in range(min(len(last_norm), len(full_norm))):
+                if last_norm[i] == full_norm[i]:
+                    common_prefix_len = i + 1
+                    mismatches = 0
+                else:
+                    mismatches += 1
+                    if mismatches > max_mismatches:
+                        break
 
-        for i in range(min(len(last_words), len(full_words))):
-            if normalize_word(last_words[i]) == normalize_word(full_words[i]):
-                common_prefix_len = i + 1
-                mismatches = 0
+            # Get candidate new content
+            if common_prefix_len > 0:
+                candidate_words = full_words[common_prefix_len:]
             else:
-                mismatches += 1
-                if mismatches > max_mismatches:
-                    break
-
-        # Get candidate new content
-        if common_prefix_len > 0:
-            candidate_words = full_words[common_prefix_len:]
-        elif len(full_words) > len(last_words):
-            candidate_words = full_words[len(last_words):]
-        else:
-            return ""
+                candidate_words = full_words[len(last_norm):]
 
         if not candidate_words:
             return ""
 
         # Filter hallucinations from candidate content too
-        candidate_text = filter_hallucinations(" ".join(candidate_words))
+        candidate_text = _filter_hallucinations(" ".join(candidate_words))
         if not candidate_text:
             return ""
         candidate_words = candidate_text.split()
@@ -433,7 +798,7 @@ class WhisperProvider(TranscriptionProvider):
             # Get a window of words starting at position i
             window_size = min(5, len(candidate_words) - i)
             window = candidate_words[i:i + window_size]
-            window_phrase = normalize_phrase(" ".join(window))
+            window_phrase = _normalize_phrase(" ".join(window))
 
             # Check if this phrase (or similar) was already emitted
             is_duplicate = False
@@ -463,7 +828,7 @@ class WhisperProvider(TranscriptionProvider):
         new_content = " ".join(filtered_words).strip()
 
         # Final hallucination filter on output
-        new_content = filter_hallucinations(new_content)
+        new_content = _filter_hallucinations(new_content)
 
         # Track these new phrases as emitted
         if new_content:
@@ -473,12 +838,11 @@ class WhisperProvider(TranscriptionProvider):
 
     def _add_emitted_phrases(self, text: str) -> None:
         """Add phrases from text to the emitted set for duplicate detection."""
-        import re
         words = text.split()
         # Add 5-word phrases
         for i in range(len(words) - 4):
             phrase = " ".join(words[i:i+5])
-            normalized = re.sub(r'[^\w\s]', '', phrase.lower()).strip()
+            normalized = _normalize_phrase(phrase)
             self._emitted_phrases.add(normalized)
         # Limit size to prevent memory issues - clear when too large
         # (sets are unordered so we can't meaningfully keep "recent" ones)
@@ -490,24 +854,26 @@ class WhisperProvider(TranscriptionProvider):
         Accumulate audio data for batch transcription.
 
         Args:
-            audio_data: Audio bytes (webm/opus from browser MediaRecorder)
+            audio_data: Audio bytes (webm/opus from browser MediaRecorder,
+                or raw 16-bit 16kHz mono PCM)
         """
         if self._is_active:
-            self._audio_buffer.extend(audio_data)
+            if self._is_pcm is None:
+                self._is_pcm = not audio_data.startswith(_EBML_MAGIC)
+                self._first_audio_at = time.monotonic()
+            self._audio_chunks.append(audio_data)
+            self._audio_size += len(audio_data)
+            self._received_bytes += len(audio_data)
+            self._new_audio.set()
+
+    def flush(self) -> None:
+        """Transcribe the buffered audio now instead of at the next interval."""
+        self._flush_event.set()
 
     async def receive_transcripts(self) -> AsyncGenerator[TranscriptionResult, None]:
-        """Yield transcription results as they're processed."""
-        while self._is_active or not self._transcript_queue.empty():
-            try:
-                result = await asyncio.wait_for(
-                    self._transcript_queue.get(),
-                    timeout=0.1
-                )
-                yield result
-            except asyncio.TimeoutError:
-                continue
-            except Exception:
-                break
+        """Yield transcription results as they're processed, until closed."""
+        async for result in _drain_transcripts(self._transcript_queue):
+            yield result
 
     async def close(self) -> None:
         """Close the Whisper provider."""
@@ -520,6 +886,13 @@ class WhisperProvider(TranscriptionProvider):
             except asyncio.CancelledError:
                 pass
 
+        for task in list(self._inflight.values()):
+            task.cancel()
+        if self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+        _signal_shutdown(self._transcript_queue)
+
 
 class PauseDetector:
     """
@@ -544,15 +917,19 @@ class PauseDetector:
         self.pause_threshold_ms = pause_threshold_ms
         self.on_pause = on_pause
 
-        self._last_transcript_time: Optional[datetime] = None
-        self._accumulated_transcript = ""
+        # time.monotonic() of the latest result; the running timer reads it
+        self._last_transcript_time: Optional[float] = None
+        # Final results since the last pause, joined when the pause fires
+        self._segments: list[str] = []
         self._pause_task: Optional[asyncio.Task] = None
+        # True while the timer task is running the on_pause callback
+        self._firing = False
         self._is_active = False
 
     def start(self) -> None:
         """Start the pause detector."""
         self._is_active = True
-        self._accumulated_transcript = ""
+        self._segments = []
         self._last_transcript_time = None
 
     def stop(self) -> None:
@@ -566,22 +943,25 @@ class PauseDetector:
         Process a new transcript result.
 
         Called whenever new transcription is received.
-        Resets the pause timer and accumulates final transcripts.
+        Pushes back the pause deadline and accumulates final transcripts.
         """
         if not self._is_active:
             return
 
-        self._last_transcript_time = datetime.utcnow()
+        self._last_transcript_time = time.monotonic()
 
         # Accumulate final transcripts
         if result.is_final and result.text:
-            if self._accumulated_transcript:
-                self._accumulated_transcript += " " + result.text
-            else:
-                self._accumulated_transcript = result.text
+            self._segments.append(result.text)
 
-        # Cancel existing pause timer
-        if self._pause_task:
+        # A waiting timer re-reads the deadline when it wakes, so it only
+        # needs replacing once it has finished or is running the callback
+        if self._pause_task and not self._pause_task.done() and not self._firing:
+            return
+
+        # New speech interrupts a running callback. Awaiting it lets its
+        # cleanup finish before the replacement timer starts.
+        if self._pause_task and not self._pause_task.done():
             self._pause_task.cancel()
             try:
                 await self._pause_task
@@ -593,28 +973,53 @@ class PauseDetector:
 
     async def _pause_timer(self) -> None:
         """
-        Timer task that triggers on_pause after threshold.
+        Timer task that triggers on_pause once no transcript has arrived
+        for the threshold.
         """
+        threshold = self.pause_threshold_ms / 1000.0
         try:
-            await asyncio.sleep(self.pause_threshold_ms / 1000.0)
+            # Sleep until the deadline; results arriving meanwhile move it
+            while True:
+                delay = self._last_transcript_time + threshold - time.monotonic()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
 
             # Pause detected - trigger callback with accumulated transcript
-            if self._accumulated_transcript and self.on_pause:
-                transcript = self._accumulated_transcript
-                self._accumulated_transcript = ""  # Reset for next segment
+            if self._segments and self.on_pause:
+                transcript = " ".join(self._segments)
+                self._segments = []  # Reset for next segment
+                self._firing = True
                 await self.on_pause(transcript)
 
         except asyncio.CancelledError:
-            # Timer was cancelled due to new speech
+            # Timer was cancelled due to new speech or stop()
             pass
+        finally:
+            self._firing = False
 
     def get_accumulated_transcript(self) -> str:
         """Get the current accumulated transcript."""
-        return self._accumulated_transcript
+        return " ".join(self._segments)
 
     def clear_accumulated(self) -> None:
         """Clear the accumulated transcript."""
-        self._accumulated_transcript = ""
+        self._segments = []
+
+
+@functools.lru_cache(maxsize=1)
+def _provider_class() -> type[TranscriptionProvider]:
+    """Pick the provider class from the environment, once per process."""
+    provider = os.getenv("TRANSCRIPTION_PROVIDER", "whisper").lower()
+
+    if provider == "deepgram":
+        if os.getenv("DEEPGRAM_API_KEY"):
+            return DeepgramProvider
+        # Fall back to Whisper if Deepgram key not configured
+        logger.warning("Deepgram API key not found, falling back to Whisper")
+
+    # Default to Whisper
+    return WhisperProvider
 
 
 def get_transcription_provider() -> TranscriptionProvider:
@@ -622,16 +1027,7 @@ def get_transcription_provider() -> TranscriptionProvider:
     Get the configured transcription provider.
 
     Returns Whisper by default (more reliable), can use Deepgram if configured.
+    The choice is made once; each call returns a new instance, since
+    providers hold per-session state.
     """
-    provider = os.getenv("TRANSCRIPTION_PROVIDER", "whisper").lower()
-
-    if provider == "deepgram":
-        try:
-            return DeepgramProvider()
-        except ValueError:
-            # Fall back to Whisper if Deepgram key not configured
-            logger.warning("Deepgram API key not found, falling back to Whisper")
-            return WhisperProvider()
-    else:
-        # Default to Whisper
-        return WhisperProvider()
+    return _provider_class()()
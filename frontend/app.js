@@ -11,13 +11,16 @@ const state = {
     ws: null,
     wsReconnectAttempts: 0,
     maxReconnectAttempts: 5,
-    mediaRecorder: null,
+    audioContext: null,
     audioStream: null,
+    speechMonitor: null,
     isRecording: false,
     transcript: '',
     interimTranscript: '',
     document: '',
+    docVersion: 0,
     aiResponses: [],
+    streamingResponse: null,
     showTranscript: false,
 };
 
@@ -57,6 +60,14 @@ function connectWebSocket() {
     state.ws.onopen = () => {
         state.wsReconnectAttempts = 0;
         updateStatus(true);
+        // Resume the session after a reconnect so its context is restored
+        if (state.isSessionActive && state.sessionId) {
+            sendMessage({
+                type: 'start_session',
+                session_id: state.sessionId,
+                document_id: state.documentId,
+            });
+        }
     };
 
     state.ws.onclose = () => {
@@ -92,11 +103,17 @@ function sendMessage(message) {
 
 function handleMessage(message) {
     switch (message.type) {
+        case 'batch':
+            // Several server messages coalesced into one frame
+            message.messages.forEach(handleMessage);
+            break;
+
         case 'session_started':
             state.sessionId = message.session_id;
             state.documentId = message.document_id;
             elements.exportBtn.disabled = false;
             startAudioCapture();
+            resetDocumentMirror(message.structure, message.doc_version);
             if (message.document) updateDocument(message.document);
             break;
 
@@ -108,13 +125,27 @@ function handleMessage(message) {
             handleTranscript(message);
             break;
 
+        case 'transcript_delta':
+            handleTranscriptDelta(message);
+            break;
+
+        case 'ai_response_delta':
+            appendAIResponseDelta(message.text);
+            break;
+
         case 'ai_response':
             addAIResponse(message.conversation);
-            if (message.updated_document) updateDocument(message.updated_document);
+            applyDocumentUpdates(message.document_updates, message.doc_version);
             break;
 
         case 'document':
-            updateDocument(message.markdown);
+            resetDocumentMirror(message.structure, message.doc_version);
+            updateDocument(renderMirrorMarkdown());
+            break;
+
+        case 'processing':
+            // Drop any partial stream left behind by a failed AI turn
+            if (message.status === 'completed') state.streamingResponse = null;
             break;
 
         case 'error':
@@ -164,34 +195,83 @@ async function setupAudioCapture() {
         }
     });
 
-    const mimeType = MediaRecorder.isTypeSupported('audio/webm;codecs=opus')
-        ? 'audio/webm;codecs=opus'
-        : 'audio/webm';
-
-    state.mediaRecorder = new MediaRecorder(state.audioStream, {
-        mimeType,
-        audioBitsPerSecond: 16000,
+    // Audio goes out as raw 16-bit 16kHz mono PCM, the format Deepgram is
+    // set up for; Whisper gets it in a WAV header, so any window of it can
+    // be uploaded without the start of the stream
+    const context = new AudioContext();
+    await context.audioWorklet.addModule('/static/pcm-worklet.js');
+    const source = context.createMediaStreamSource(state.audioStream);
+    const capture = new AudioWorkletNode(context, 'pcm-capture', {
+        numberOfInputs: 1,
+        numberOfOutputs: 0,
     });
 
-    state.mediaRecorder.ondataavailable = async (event) => {
-        if (event.data.size > 0 && state.isRecording) {
-            const base64 = await blobToBase64(event.data);
-            sendMessage({ type: 'audio', data: base64 });
+    capture.port.onmessage = (event) => {
+        // Sent as a raw binary frame, no base64 round-trip
+        if (state.isRecording && state.ws?.readyState === WebSocket.OPEN) {
+            state.ws.send(event.data);
         }
     };
+
+    source.connect(capture);
+    state.audioContext = context;
+    startSpeechMonitor(context, source);
+}
+
+// Speech pause detection. The browser watches the mic level and reports
+// when speech stops; the server then transcribes straight away instead of
+// at its next interval.
+const SPEECH_LEVEL = 0.02;      // RMS above this counts as speech
+const SPEECH_PAUSE_MS = 400;    // silence after speech before reporting
+const SPEECH_POLL_MS = 50;
+
+function startSpeechMonitor(context, source) {
+    const analyser = context.createAnalyser();
+    analyser.fftSize = 1024;
+    source.connect(analyser);
+
+    const samples = new Float32Array(analyser.fftSize);
+    let speaking = false;
+    let lastSpeech = 0;
+
+    const timer = setInterval(() => {
+        if (!state.isRecording) return;
+        analyser.getFloatTimeDomainData(samples);
+        let sum = 0;
+        for (const s of samples) sum += s * s;
+        const now = performance.now();
+
+        if (Math.sqrt(sum / samples.length) > SPEECH_LEVEL) {
+            speaking = true;
+            lastSpeech = now;
+        } else if (speaking && now - lastSpeech >= SPEECH_PAUSE_MS) {
+            speaking = false;
+            sendMessage({ type: 'speech_pause' });
+        }
+    }, SPEECH_POLL_MS);
+
+    state.speechMonitor = { timer };
+}
+
+function stopSpeechMonitor() {
+    if (!state.speechMonitor) return;
+    clearInterval(state.speechMonitor.timer);
+    state.speechMonitor = null;
 }
 
 function startAudioCapture() {
-    if (state.mediaRecorder?.state === 'inactive') {
+    if (state.audioContext) {
         state.isRecording = true;
-        state.mediaRecorder.start(250);
+        state.audioContext.resume();
     }
 }
 
 function stopAudioCapture() {
     state.isRecording = false;
-    if (state.mediaRecorder?.state !== 'inactive') {
-        state.mediaRecorder.stop();
+    stopSpeechMonitor();
+    if (state.audioContext) {
+        state.audioContext.close();
+        state.audioContext = null;
     }
     if (state.audioStream) {
         state.audioStream.getTracks().forEach(track => track.stop());
@@ -199,15 +279,6 @@ function stopAudioCapture() {
     }
 }
 
-function blobToBase64(blob) {
-    return new Promise((resolve, reject) => {
-        const reader = new FileReader();
-        reader.onloadend = () => resolve(reader.result.split(',')[1]);
-        reader.onerror = reject;
-        reader.readAsDataURL(blob);
-    });
-}
-
 // Transcript Handling
 function handleTranscript(message) {
     if (message.is_final) {
@@ -219,6 +290,12 @@ function handleTranscript(message) {
     updateTranscriptDisplay();
 }
 
+function handleTranscriptDelta(message) {
+    // Deltas extend the current utterance unless the server revised it
+    const text = message.reset ? message.delta : state.interimTranscript + message.delta;
+    handleTranscript({ text, is_final: message.is_final });
+}
+
 function updateTranscriptDisplay() {
     if (!state.showTranscript) return;
 
@@ -267,14 +344,101 @@ function updateDocument(markdown) {
     }
 }
 
-function addAIResponse(response) {
-    if (!response) return;
+// Document mirror: a copy of the server's StructuredDocument
+// (backend/document_manager.py) kept current by replaying the same
+// document_updates, so ai_response doesn't need to carry the whole document
+const docMirror = { sections: [] };
 
-    state.aiResponses.push({
-        text: response,
-        timestamp: new Date(),
-    });
+function resetDocumentMirror(structure, version) {
+    docMirror.sections = structuredClone(structure?.sections || []);
+    state.docVersion = version || 0;
+}
 
+function findSection(sections, title) {
+    const key = title.toLowerCase();
+    return sections.find(s => s.title.toLowerCase() === key);
+}
+
+function findOrCreateSection(title) {
+    let section = findSection(docMirror.sections, title);
+    if (!section) {
+        section = { title, content: '', subsections: [] };
+        docMirror.sections.push(section);
+    }
+    return section;
+}
+
+function appendContent(section, content) {
+    section.content = section.content ? `${section.content}\n${content}` : content;
+}
+
+function addToSubsection(sectionTitle, subTitle, content) {
+    const section = findOrCreateSection(sectionTitle);
+    section.subsections = section.subsections || [];
+    const sub = findSection(section.subsections, subTitle);
+    if (sub) {
+        appendContent(sub, content);
+    } else {
+        section.subsections.push({ title: subTitle, content, subsections: [] });
+    }
+}
+
+function applyMirrorUpdate({ action, path, content }) {
+    const parts = path.split('/');
+    switch (action.toLowerCase()) {
+        case 'add_section': {
+            const existing = findSection(docMirror.sections, path);
+            if (existing) {
+                if (content) appendContent(existing, content);
+            } else {
+                docMirror.sections.push({ title: path, content, subsections: [] });
+            }
+            break;
+        }
+        case 'create_subsection':
+            if (parts.length === 2) addToSubsection(parts[0], parts[1], content);
+            break;
+        case 'add_action_item':
+            appendContent(findOrCreateSection('Action Items'),
+                content.startsWith('-') ? content : `- [ ] ${content}`);
+            break;
+        case 'add_blocker':
+            appendContent(findOrCreateSection('Blockers & Open Questions'),
+                content.startsWith('-') ? content : `- ${content}`);
+            break;
+        default:
+            // add_to_section, and the server's fallback for unknown actions
+            if (parts.length === 1) {
+                appendContent(findOrCreateSection(parts[0]), content);
+            } else if (parts.length === 2) {
+                addToSubsection(parts[0], parts[1], content);
+            }
+    }
+}
+
+function renderMirrorMarkdown() {
+    return docMirror.sections.map(section => {
+        const body = section.content ? `\n${section.content}\n` : '';
+        const subsections = (section.subsections || []).map(sub =>
+            `\n### ${sub.title}\n` + (sub.content ? `\n${sub.content}\n` : '')
+        ).join('');
+        return `## ${section.title}\n${body}${subsections}`;
+    }).join('\n');
+}
+
+function applyDocumentUpdates(updates, version) {
+    if (version === state.docVersion) return;
+    if (version !== state.docVersion + 1) {
+        // Missed a change; fetch the full document instead
+        sendMessage({ type: 'get_document' });
+        return;
+    }
+    (updates || []).forEach(applyMirrorUpdate);
+    state.docVersion = version;
+    updateDocument(renderMirrorMarkdown());
+}
+
+function createAIResponseElement() {
     // Remove placeholder if present
     const placeholder = elements.aiResponses.querySelector('.placeholder');
     if (placeholder) placeholder.remove();
@@ -284,7 +448,6 @@ function addAIResponse(response) {
     responseEl.className = 'ai-response-item';
 
     const contentEl = document.createElement('div');
-    contentEl.innerHTML = formatMarkdown(response);
 
     const timeEl = document.createElement('div');
     timeEl.className = 'response-time';
@@ -294,6 +457,35 @@ function addAIResponse(response) {
     responseEl.appendChild(timeEl);
     elements.aiResponses.appendChild(responseEl);
 
+    return { responseEl, contentEl };
+}
+
+function appendAIResponseDelta(text) {
+    if (!text) return;
+
+    if (!state.streamingResponse) {
+        state.streamingResponse = { ...createAIResponseElement(), text: '' };
+    }
+
+    const stream = state.streamingResponse;
+    stream.text += text;
+    stream.contentEl.innerHTML = formatMarkdown(stream.text);
+    stream.responseEl.scrollIntoView({ behavior: 'smooth', block: 'end' });
+}
+
+function addAIResponse(response) {
+    if (!response) return;
+
+    state.aiResponses.push({
+        text: response,
+        timestamp: new Date(),
+    });
+
+    // Finalize the streamed element if there is one, otherwise create it
+    const { responseEl, contentEl } = state.streamingResponse || createAIResponseElement();
+    state.streamingResponse = null;
+    contentEl.innerHTML = formatMarkdown(response);
+
     // Scroll to latest response
     responseEl.scrollIntoView({ behavior: 'smooth', block: 'end' });
 }
@@ -319,15 +511,22 @@ async function openExportModal() {
         const response = await fetch(`/api/documents/${state.documentId}/export`);
         if (!response.ok) throw new Error('Failed to fetch');
 
-        const data = await response.json();
-        elements.exportPreview.value = data.markdown;
+        elements.exportPreview.value = await response.text();
         elements.exportModal.classList.remove('hidden');
-        elements.downloadExportBtn.dataset.filename = data.filename;
+        elements.downloadExportBtn.dataset.filename = exportFilename(response);
     } catch (e) {
         showError('Failed to export');
     }
 }
 
+function exportFilename(response) {
+    const disposition = response.headers.get('Content-Disposition') || '';
+    const encoded = disposition.match(/filename\*=UTF-8''([^;]+)/i);
+    if (encoded) return decodeURIComponent(encoded[1]);
+    const plain = disposition.match(/filename="([^"]+)"/i);
+    return plain ? plain[1] : 'notes.md';
+}
+
 function closeExportModal() {
     elements.exportModal.classList.add('hidden');
 }
@@ -423,6 +622,7 @@ elements.backBtn.addEventListener('click', () => {
     state.interimTranscript = '';
     state.document = '';
     state.aiResponses = [];
+    state.streamingResponse = null;
     elements.documentTitle.textContent = 'New Session';
     elements.aiResponses.innerHTML = '<p class="placeholder">AI responses will appear here as you think out loud...</p>';
     elements.notesContent.innerHTML = '<p class="placeholder">Organized notes will appear here...</p>';
@@ -0,0 +1,48 @@
+/**
+ * Thinking Partner - Microphone capture worklet
+ * Downsamples the microphone to 16 kHz mono and posts it as 16-bit PCM
+ */
+
+const TARGET_RATE = 16000;
+const FRAME_SAMPLES = TARGET_RATE / 10;  // post every 100ms
+
+class PcmCaptureProcessor extends AudioWorkletProcessor {
+    constructor() {
+        super();
+        // Input samples per output sample; sampleRate is the context's rate
+        this.ratio = sampleRate / TARGET_RATE;
+        this.position = 0;
+        this.sum = 0;
+        this.count = 0;
+        this.frame = new Int16Array(FRAME_SAMPLES);
+        this.length = 0;
+    }
+
+    process(inputs) {
+        const channel = inputs[0][0];
+        if (!channel) return true;
+
+        // Each output sample is the average of the input samples it spans
+        for (let i = 0; i < channel.length; i++) {
+            this.sum += channel[i];
+            this.count++;
+            this.position++;
+            if (this.position < this.ratio) continue;
+
+            this.position -= this.ratio;
+            const sample = Math.max(-1, Math.min(1, this.sum / this.count));
+            this.sum = 0;
+            this.count = 0;
+            this.frame[this.length++] = sample * 0x7fff;
+
+            if (this.length === FRAME_SAMPLES) {
+                this.port.postMessage(this.frame.buffer, [this.frame.buffer]);
+                this.frame = new Int16Array(FRAME_SAMPLES);
+                this.length = 0;
+            }
+        }
+        return true;
+    }
+}
+
+registerProcessor('pcm-capture', PcmCaptureProcessor);